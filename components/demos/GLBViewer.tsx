@@ -1,11 +1,15 @@
 // /components/demos/GLBViewer.tsx
-import { useEffect, useRef, useState } from 'react';
+import { useEffect, useMemo, useRef, useState } from 'react';
 import * as THREE from 'three';
 import { OrbitControls } from 'three/examples/jsm/controls/OrbitControls';
 import { GLTFLoader } from 'three/examples/jsm/loaders/GLTFLoader';
 
 interface GLBViewerProps {
-  modelPath: string;
+  modelPath?: string;
+  // Levels of detail from the smallest file to the most detailed (e.g. the
+  // cow-lod*.glb files written by cow_export.py). The first level is shown as soon
+  // as it arrives and each later one replaces it when loaded.
+  lodPaths?: string[];
   width?: number;
   height?: number;
   backgroundColor?: string;
@@ -14,6 +18,7 @@ interface GLBViewerProps {
 
 export default function GLBViewer({
   modelPath,
+  lodPaths,
   width = 400,
   height = 400,
   backgroundColor = '#f5f5f5',
@@ -23,8 +28,14 @@ export default function GLBViewer({
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
+  // The same list of files keeps the same array across renders, so a parent passing
+  // a fresh lodPaths array each render does not reload the model
+  const pathsKey = (lodPaths ?? (modelPath ? [modelPath] : [])).join('\n');
+  const paths = useMemo(() => (pathsKey ? pathsKey.split('\n') : []), [pathsKey]);
+
   useEffect(() => {
-    if (!containerRef.current) return;
+    if (!containerRef.current || paths.length === 0) return;
+    let disposed = false;
 
     // Create scene
     const scene = new THREE.Scene();
@@ -55,39 +66,67 @@ export default function GLBViewer({
     controls.autoRotate = autoRotate;
     controls.autoRotateSpeed = 1;
 
-    // Load GLB model
+    // Load the GLB levels of detail in order, replacing the shown model with each
     const loader = new GLTFLoader();
-    loader.load(
-      modelPath,
-      (gltf) => {
-        // Center the model
-        const box = new THREE.Box3().setFromObject(gltf.scene);
-        const center = box.getCenter(new THREE.Vector3());
-        const size = box.getSize(new THREE.Vector3());
-        
-        // Adjust camera and model position
-        const maxDim = Math.max(size.x, size.y, size.z);
-        camera.position.z = maxDim * 2.5;
-        gltf.scene.position.x = -center.x;
-        gltf.scene.position.y = -center.y;
-        gltf.scene.position.z = -center.z;
-        
-        scene.add(gltf.scene);
-        setLoading(false);
-      },
-      (xhr) => {
-        // Load progress can be tracked here if needed
-      },
-      (error) => {
-        console.error('Error loading GLB:', error);
-        setError('Failed to load 3D model');
-        setLoading(false);
-      }
-    );
+    let current: THREE.Object3D | null = null;
+    let center: THREE.Vector3 | null = null;
+
+    const release = (object: THREE.Object3D) => {
+      object.traverse((child) => {
+        if (child instanceof THREE.Mesh) {
+          child.geometry.dispose();
+          const materials = Array.isArray(child.material) ? child.material : [child.material];
+          materials.forEach((material) => material.dispose());
+        }
+      });
+    };
+
+    const loadLevel = (level: number) => {
+      loader.load(
+        paths[level],
+        (gltf) => {
+          if (disposed) {
+            release(gltf.scene);
+            return;
+          }
+          // Center the model and fit the camera on the first level; later levels
+          // share its placement, so swapping them does not move the view
+          if (!center) {
+            const box = new THREE.Box3().setFromObject(gltf.scene);
+            center = box.getCenter(new THREE.Vector3());
+            const size = box.getSize(new THREE.Vector3());
+            const maxDim = Math.max(size.x, size.y, size.z);
+            camera.position.z = maxDim * 2.5;
+            camera.near = maxDim / 100;
+            camera.far = maxDim * 100;
+            camera.updateProjectionMatrix();
+          }
+          gltf.scene.position.copy(center).negate();
+
+          scene.add(gltf.scene);
+          if (current) {
+            scene.remove(current);
+            release(current);
+          }
+          current = gltf.scene;
+          setLoading(false);
+          if (level + 1 < paths.length) loadLevel(level + 1);
+        },
+        undefined,
+        (error) => {
+          console.error('Error loading GLB:', error);
+          // A missing detail level still leaves the coarser model on screen
+          if (!current) setError('Failed to load 3D model');
+          setLoading(false);
+        }
+      );
+    };
+    loadLevel(0);
 
     // Animation loop
+    let frame = 0;
     const animate = () => {
-      requestAnimationFrame(animate);
+      frame = requestAnimationFrame(animate);
       controls.update();
       renderer.render(scene, camera);
     };
@@ -96,12 +135,15 @@ export default function GLBViewer({
 
     // Cleanup
     return () => {
+      disposed = true;
+      cancelAnimationFrame(frame);
+      if (current) release(current);
       if (containerRef.current) {
         containerRef.current.removeChild(renderer.domElement);
       }
       renderer.dispose();
     };
-  }, [modelPath, width, height, backgroundColor, autoRotate]);
+  }, [paths, width, height, backgroundColor, autoRotate]);
 
   return (
     <div className="glb-viewer-container">
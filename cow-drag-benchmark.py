@@ -0,0 +1,36 @@
+import time
+import numpy as np
+from cow_drag import drag_force, projected_areas, sphere_directions
+from cow_geometry import DEFAULT_PARAMETERS, assembled_mesh, cow_parts
+
+# Projected areas of the realistic cow from its mesh: the front/side/top areas
+# against the old fudge factors, then a tumbling-body study over 10^4 view
+# directions and the drag on the grid of velocities x orientations x fluids.
+
+p = DEFAULT_PARAMETERS
+vertices, triangles = assembled_mesh([tree for tree, _ in cow_parts().values()], resolution=16)
+print(f"Mesh: {len(triangles)} triangles")
+
+fudge = np.array([p["body_width"] * p["body_height"] * 0.7, p["body_length"] * p["body_height"] * 0.7,
+                  p["body_length"] * p["body_width"] * 0.8])
+for pixels in (128, 256, 1024):
+    start = time.perf_counter()
+    areas = projected_areas(vertices, triangles, np.eye(3), pixels=pixels)
+    print(f"{pixels:5d} px: front/side/top {areas.round(0)} mm^2 in {time.perf_counter() - start:.2f} s"
+          f" (fudge factors {fudge.round(0)})")
+
+directions = sphere_directions(10_000)
+start = time.perf_counter()
+areas = projected_areas(vertices, triangles, directions)
+elapsed = time.perf_counter() - start
+print(f"\n{len(directions)} directions: {elapsed:.1f} s ({elapsed / len(directions) * 1e3:.2f} ms each)")
+print(f"Projected area min {areas.min():.0f}, mean {areas.mean():.0f}, max {areas.max():.0f} mm^2")
+worst = directions[np.argmax(areas)]
+print(f"Largest silhouette seen along {worst.round(2)}")
+
+velocities = np.arange(1, 20.5, 0.25)
+fluids = np.array([1.225, 998.0])  # air, water (kg/m^3)
+start = time.perf_counter()
+F = drag_force(velocities, areas * 1e-6, fluids, 0.8)
+print(f"\nDrag grid {F.shape} (velocity x orientation x fluid) in {(time.perf_counter() - start) * 1e3:.1f} ms;"
+      f" tumbling mean at 10 m/s in air {F[np.searchsorted(velocities, 10), :, 0].mean():.3f} N")
@@ -0,0 +1,32 @@
+import os
+import tempfile
+import time
+import numpy as np
+from cow_report import evaluate, render_plots, table_from_rows, write_table
+
+# Output stage of a design sweep: evaluate cow variants headless into a columnar
+# table, write it in bulk, and render the report figures serially and in a
+# process pool.
+
+def main():
+    variants = [{"body_length": L, "leg_length": leg} for L in (90, 100, 110) for leg in (30, 35, 40)]
+    start = time.perf_counter()
+    table = table_from_rows([evaluate(p) for p in variants])
+    print(f"{len(variants)} variants evaluated in {time.perf_counter() - start:.1f} s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for extension in (".csv", ".npz"):
+            start = time.perf_counter()
+            path = write_table(table, os.path.join(directory, "sweep" + extension))
+            print(f"Table {extension}: {(time.perf_counter() - start) * 1e3:.1f} ms, {os.path.getsize(path)} bytes")
+
+        for workers in (1, None):
+            start = time.perf_counter()
+            plots = render_plots(table, os.path.join(directory, f"plots-{workers}"), workers=workers)
+            print(f"{len(plots)} figures, workers={workers or os.cpu_count()}: {time.perf_counter() - start:.2f} s")
+
+    print("\nHeat dissipation ratio (spherical / realistic surface area) by variant:",
+          np.round(table["heat_dissipation_ratio"], 3))
+
+if __name__ == "__main__":
+    main()
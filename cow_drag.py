@@ -0,0 +1,116 @@
+import numpy as np
+
+# Projected (silhouette) areas of a triangle mesh seen from many directions, and
+# quadratic drag F = rho v^2 Cd A / 2 from them.
+#
+# The silhouette along a direction is the union of the projections of the mesh's
+# front-facing triangles onto the view plane, rasterized on a pixel grid spanning
+# the mesh's bounding sphere (the same grid for every direction). The triangles of
+# a whole batch of directions are scan-converted together, grouped by the number
+# of pixel rows they span, so each group is one array operation however many
+# directions there are.
+
+# Triangle rows scan-converted per array operation
+RASTER_BATCH = 1 << 22
+
+def sphere_directions(n, hemisphere=False):
+    """n unit vectors spread evenly over the sphere (Fibonacci lattice), shape (n, 3).
+
+    A silhouette seen along d is the mirror image of the one along -d, so for
+    areas the upper hemisphere (hemisphere=True) covers every orientation.
+    """
+    i = np.arange(n) + 0.5
+    z = 1 - i / n if hemisphere else 1 - 2 * i / n
+    phi = np.pi * (3 - np.sqrt(5)) * i
+    r = np.sqrt(1 - z * z)
+    return np.column_stack([r * np.cos(phi), r * np.sin(phi), z])
+
+def view_bases(directions):
+    """Orthonormal view-plane axes (e1, e2) for each viewing direction, shape (n, 2, 3)"""
+    d = np.atleast_2d(np.asarray(directions, dtype=float))
+    d = d / np.linalg.norm(d, axis=1, keepdims=True)
+    helper = np.where((np.abs(d[:, 2]) < 0.9)[:, None], [0.0, 0, 1], [1.0, 0, 0])
+    e1 = np.cross(d, helper)
+    e1 /= np.linalg.norm(e1, axis=1, keepdims=True)
+    return np.stack([e1, np.cross(d, e1)], axis=1)
+
+def _rasterize(view, uv, n_views, pixels):
+    """Coverage images (n_views, pixels, pixels) of the projected triangles uv (shape (m, 3, 2),
+    in pixel units) seen along the directions `view` (m,).
+
+    Scanline fill: every pixel row through a triangle gets +1 at the first covered
+    pixel centre and -1 after the last one, and a running sum along the rows counts
+    the triangles over each pixel, so the cost grows with the rows a triangle
+    spans, not with its area.
+    """
+    y = uv[..., 1]
+    first = np.clip(np.ceil(y.min(axis=1) - 0.5), 0, pixels).astype(np.int64)
+    last = np.clip(np.floor(y.max(axis=1) - 0.5), -1, pixels - 1).astype(np.int64)
+    rows = last - first + 1
+    # Row counts rounded up to powers of two, one array operation per count
+    size = 1 << np.ceil(np.log2(np.maximum(rows, 1))).astype(np.int64)
+    starts, stops = [], []
+    for k in np.unique(size[rows > 0]):
+        for g in np.array_split(np.flatnonzero((size == k) & (rows > 0)), max(1, k * len(uv) // RASTER_BATCH)):
+            row = first[g, None] + np.arange(k)
+            yc = row + 0.5
+            left = np.full(row.shape, np.inf)
+            right = np.full(row.shape, -np.inf)
+            for i, j in ((0, 1), (1, 2), (2, 0)):
+                x0, y0 = uv[g, i, 0, None], uv[g, i, 1, None]
+                x1, y1 = uv[g, j, 0, None], uv[g, j, 1, None]
+                crosses = (np.minimum(y0, y1) <= yc) & (yc <= np.maximum(y0, y1)) & (y0 != y1)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    x = np.where(crosses, x0 + (yc - y0) * (x1 - x0) / (y1 - y0), np.nan)
+                left = np.fmin(left, x)
+                right = np.fmax(right, x)
+            start = np.clip(np.ceil(left - 0.5), 0, pixels)
+            stop = np.clip(np.floor(right - 0.5) + 1, 0, pixels)
+            valid = (row <= last[g, None]) & (start < stop)
+            base = (view[g, None] * pixels + row) * (pixels + 1)
+            starts.append((base + start)[valid].astype(np.int64))
+            stops.append((base + stop)[valid].astype(np.int64))
+    size = n_views * pixels * (pixels + 1)
+    difference = np.bincount(np.concatenate(starts + [np.zeros(0, np.int64)]), minlength=size) - \
+        np.bincount(np.concatenate(stops + [np.zeros(0, np.int64)]), minlength=size)
+    return np.cumsum(difference.reshape(n_views, pixels, pixels + 1), axis=2)[..., :pixels]
+
+def projected_areas(vertices, triangles, directions, pixels=256, chunk=64):
+    """Silhouette area of a closed (or closed-part) mesh seen along each direction.
+
+    directions has shape (n, 3); the result has shape (n,), in the squared units of
+    the vertices. The pixel size is the bounding-sphere diameter / pixels, so the
+    error shrinks with the silhouette's perimeter times the pixel size.
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    directions = np.atleast_2d(np.asarray(directions, dtype=float))
+    centre = (vertices.min(axis=0) + vertices.max(axis=0)) / 2
+    radius = np.linalg.norm(vertices - centre, axis=1).max()
+    pixel_size = 2 * radius / pixels
+    points = (vertices - centre) / pixel_size
+    corners = points[triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+
+    areas = np.empty(len(directions))
+    for start in range(0, len(directions), chunk):
+        d = directions[start:start + chunk]
+        bases = view_bases(d)
+        # Front-facing triangles only: for closed surfaces they already cover the silhouette
+        facing = normals @ d.T > 0
+        tri, view = np.nonzero(facing)
+        # Project the vertices once per direction, then pick the triangles' corners
+        projected = (points @ bases.reshape(-1, 3).T).reshape(len(points), len(d), 2) + pixels / 2
+        uv = projected[triangles[tri], view[:, None]]
+        coverage = _rasterize(view, uv, len(d), pixels)
+        areas[start:start + chunk] = np.count_nonzero(coverage, axis=(1, 2)) * pixel_size ** 2
+    return areas
+
+def drag_force(velocity, area, fluid_density=1.225, drag_coefficient=0.8):
+    """F = rho v^2 Cd A / 2 on the grid of every velocity x area x fluid density x Cd.
+
+    Each argument is a scalar or an array (in SI units: m/s, m^2, kg/m^3) and gets
+    its own axes, so the result has shape
+    velocity.shape + area.shape + fluid_density.shape + drag_coefficient.shape.
+    """
+    v2 = np.square(np.asarray(velocity, dtype=float))
+    return 0.5 * np.multiply.outer(np.multiply.outer(np.multiply.outer(v2, area), fluid_density), drag_coefficient)
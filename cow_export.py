@@ -0,0 +1,158 @@
+import json
+import os
+import struct
+import sys
+import numpy as np
+from cow_geometry import cow_parts, tessellate
+
+# Export of the cow assembly to binary glTF (GLB) for the web viewer
+# (components/demos/GLBViewer.tsx), at several levels of detail.
+#
+# The levels come from tessellating the parametric parts at increasing resolution,
+# which decimates curved surfaces evenly and keeps cut walls (the split hooves)
+# exact at every level. Each level is one file in which the parts sharing a
+# material are merged into as few primitives as 16-bit indices allow, so a level
+# draws in about one call per material. Vertex buffers are quantized
+# (KHR_mesh_quantization): positions as 16-bit integers on a grid spanning the
+# assembly, dequantized by the node transform, and normals as normalized 8-bit
+# vectors, which takes 12 bytes per vertex instead of 24. The node also converts
+# FreeCAD's millimetres with z up to glTF's metres with y up.
+
+# Tessellation resolution of each level, from the first (smallest) file to the last
+LOD_RESOLUTIONS = (8, 16, 32)
+
+# Rotation of -90 degrees about x: z up becomes y up, as (x, y, z) -> (x, z, -y)
+_Z_UP_TO_Y_UP = [-np.sqrt(0.5), 0.0, 0.0, np.sqrt(0.5)]
+_ROTATION = np.array([[1.0, 0, 0], [0, 0, 1], [0, -1, 0]])
+
+# glTF component types and buffer targets
+_BYTE, _UNSIGNED_SHORT, _UNSIGNED_INT = 5120, 5123, 5125
+_ARRAY_BUFFER, _ELEMENT_ARRAY_BUFFER = 34962, 34963
+
+def vertex_normals(vertices, triangles):
+    """Area-weighted unit normals at the vertices"""
+    corners = vertices[triangles]
+    face = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    normals = np.zeros_like(vertices)
+    for k in range(3):
+        np.add.at(normals, triangles[:, k], face)
+    length = np.linalg.norm(normals, axis=1, keepdims=True)
+    return normals / np.where(length > 0, length, 1)
+
+def merge_by_material(parts, resolution, max_vertices=65536):
+    """[(color, vertices, triangles)] with the tessellations of the parts of each color
+    merged into as few meshes of fewer than max_vertices vertices as possible"""
+    groups = {}
+    for tree, color in parts.values():
+        groups.setdefault(color, []).append(tessellate(tree, resolution))
+    merged = []
+    for color, meshes in groups.items():
+        batch = []
+        for mesh in meshes + [None]:
+            if batch and (mesh is None or sum(len(v) for v, _ in batch) + len(mesh[0]) >= max_vertices):
+                offsets = np.cumsum([0] + [len(v) for v, _ in batch[:-1]])
+                merged.append((color, np.vstack([v for v, _ in batch]),
+                               np.vstack([t + offset for (_, t), offset in zip(batch, offsets)])))
+                batch = []
+            if mesh is not None:
+                batch.append(mesh)
+    return merged
+
+def _linear(color):
+    """sRGB color component (as FreeCAD shows it) to the linear value glTF expects"""
+    c = np.asarray(color, dtype=float)
+    return np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+
+def glb(meshes, lower, step):
+    """GLB bytes of [(color, vertices, triangles)] quantized on the grid lower + step * q"""
+    gltf = {
+        "asset": {"version": "2.0", "generator": "cow_export.py"},
+        "extensionsUsed": ["KHR_mesh_quantization"],
+        "extensionsRequired": ["KHR_mesh_quantization"],
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        # world = R (0.001 (lower + step q)) in metres, y up
+        "nodes": [{"name": "Cow", "mesh": 0, "rotation": _Z_UP_TO_Y_UP,
+                   "translation": (_ROTATION @ (lower * 1e-3)).tolist(), "scale": [step * 1e-3] * 3}],
+        "meshes": [{"name": "Cow", "primitives": []}],
+        "materials": [], "accessors": [], "bufferViews": [], "buffers": [],
+    }
+    chunks, offset = [], 0
+
+    def add_view(data, target, stride=None):
+        nonlocal offset
+        view = {"buffer": 0, "byteOffset": offset, "byteLength": len(data), "target": target}
+        if stride:
+            view["byteStride"] = stride
+        gltf["bufferViews"].append(view)
+        padding = -len(data) % 4
+        chunks.append(data + b"\0" * padding)
+        offset += len(data) + padding
+        return len(gltf["bufferViews"]) - 1
+
+    def add_accessor(view, component, count, kind, **extra):
+        gltf["accessors"].append({"bufferView": view, "componentType": component, "count": count,
+                                  "type": kind, **extra})
+        return len(gltf["accessors"]) - 1
+
+    materials = {}
+    for color, vertices, triangles in meshes:
+        n = len(vertices)
+        # Attributes are padded to 4-byte strides: 4 shorts per position, 4 bytes per normal
+        q = np.zeros((n, 4), dtype=np.uint16)
+        q[:, :3] = np.round((vertices - lower) / step)
+        normals = np.zeros((n, 4), dtype=np.int8)
+        normals[:, :3] = np.round(vertex_normals(vertices, triangles) * 127)
+        index_type, index_component = (np.uint16, _UNSIGNED_SHORT) if n < 65536 else (np.uint32, _UNSIGNED_INT)
+
+        position = add_accessor(add_view(q.tobytes(), _ARRAY_BUFFER, 8), _UNSIGNED_SHORT, n, "VEC3",
+                                min=q[:, :3].min(axis=0).tolist(), max=q[:, :3].max(axis=0).tolist())
+        normal = add_accessor(add_view(normals.tobytes(), _ARRAY_BUFFER, 4), _BYTE, n, "VEC3", normalized=True)
+        indices = add_accessor(add_view(triangles.astype(index_type).tobytes(), _ELEMENT_ARRAY_BUFFER),
+                               index_component, triangles.size, "SCALAR")
+        if color not in materials:
+            materials[color] = len(gltf["materials"])
+            gltf["materials"].append({"pbrMetallicRoughness": {"baseColorFactor": [*_linear(color).tolist(), 1.0],
+                                                               "metallicFactor": 0.0, "roughnessFactor": 0.8}})
+        gltf["meshes"][0]["primitives"].append({"attributes": {"POSITION": position, "NORMAL": normal},
+                                                "indices": indices, "material": materials[color]})
+
+    binary = b"".join(chunks)
+    gltf["buffers"].append({"byteLength": len(binary)})
+    document = json.dumps(gltf, separators=(",", ":")).encode()
+    document += b" " * (-len(document) % 4)
+    return b"".join([struct.pack("<III", 0x46546C67, 2, 12 + 8 + len(document) + 8 + len(binary)),
+                     struct.pack("<II", len(document), 0x4E4F534A), document,
+                     struct.pack("<II", len(binary), 0x004E4942), binary])
+
+def export_lods(parts, directory, name="cow", resolutions=LOD_RESOLUTIONS):
+    """Write {name}-lod{i}.glb for each resolution and {name}-lods.json with their stats.
+
+    parts is a cow_parts() dict. All levels share one quantization grid, so they
+    line up exactly when the viewer swaps them.
+    Returns the stats: file, resolution, triangles, vertices and bytes per level.
+    """
+    levels = [merge_by_material(parts, resolution) for resolution in resolutions]
+    vertices = np.vstack([v for meshes in levels for _, v, _ in meshes])
+    lower = vertices.min(axis=0)
+    step = (vertices.max(axis=0) - lower).max() / 65535
+    os.makedirs(directory, exist_ok=True)
+    stats = []
+    for i, (resolution, meshes) in enumerate(zip(resolutions, levels)):
+        data = glb(meshes, lower, step)
+        filename = f"{name}-lod{i}.glb"
+        with open(os.path.join(directory, filename), "wb") as f:
+            f.write(data)
+        stats.append({"file": filename, "resolution": resolution,
+                      "triangles": int(sum(len(t) for _, _, t in meshes)),
+                      "vertices": int(sum(len(v) for _, v, _ in meshes)),
+                      "draw_calls": len(meshes), "bytes": len(data)})
+    with open(os.path.join(directory, f"{name}-lods.json"), "w") as f:
+        json.dump({"lods": stats}, f, indent=2)
+    return stats
+
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else "."
+    for level in export_lods(cow_parts(), directory):
+        print(f"{level['file']}: resolution {level['resolution']}, {level['triangles']} triangles, "
+              f"{level['vertices']} vertices, {level['draw_calls']} draw calls, {level['bytes'] / 1024:.0f} KiB")
@@ -0,0 +1,466 @@
+import hashlib
+import math
+import os
+import numpy as np
+
+# Parametric geometry of the realistic cow, independent of FreeCAD.
+#
+# Every part is a pure function of the parameters that returns a constructive
+# solid geometry tree of plain tuples:
+#   ("ellipsoid", center, radii)
+#   ("cylinder", base, unit_direction, radius, height)
+#   ("box", corner, size, fillet)
+#   ("fuse", (child, child, ...))
+#   ("cut", base, tool)
+# The trees are cheap to build and hash, so each part is keyed by a hash of its own
+# tree. FreeCAD shapes (build_shape) and headless triangle meshes (tessellate) are
+# memoized on disk under that key, and a parameter sweep only rebuilds the parts
+# whose geometry actually changed. FreeCAD is imported only by build_shape().
+
+DEFAULT_PARAMETERS = {
+    "body_length": 100,
+    "body_width": 40,
+    "body_height": 35,
+    "body_center_z": 40,
+    "leg_length": 35,
+    "back_leg_length": 35,
+    "neck_steps": 5,
+    "tail_sections": 10,
+    "tail_section_length": 4.5,
+}
+
+# Default directory of the memo cache; the COW_GEOMETRY_CACHE environment variable
+# or the cache_dir argument of tessellate() and build_shape() override it
+CACHE_DIR = os.environ.get("COW_GEOMETRY_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "cow-geometry"))
+
+# Part of every cache key: bump it whenever _tessellate() or _make_shape() change
+# their output, so meshes and shapes cached by older code are not served
+CACHE_VERSION = 2
+
+BROWN = (0.8, 0.65, 0.5)
+DARK_BROWN = (0.7, 0.55, 0.4)
+EYE = (0.1, 0.1, 0.1)
+UDDER = (0.95, 0.8, 0.7)
+
+# Primitives and boolean operations
+
+def _vec(v):
+    return tuple(float(c) for c in v)
+
+def ellipsoid(center, radii):
+    return ("ellipsoid", _vec(center), _vec(radii))
+
+def cylinder(radius, height, base, direction=(0, 0, 1)):
+    """Cylinder from base along direction (normalized, as Part.makeCylinder does)"""
+    d = np.asarray(direction, dtype=float)
+    return ("cylinder", _vec(base), _vec(d / np.linalg.norm(d)), float(radius), float(height))
+
+def box(length, width, height, corner, fillet=0.0):
+    """Axis-aligned box from its minimum corner, with an optional edge fillet radius"""
+    return ("box", _vec(corner), _vec((length, width, height)), float(fillet))
+
+def fuse(*children):
+    return ("fuse", tuple(children))
+
+def cut(base, tool):
+    return ("cut", base, tool)
+
+def primitives(tree):
+    """Leaf primitives of a tree, each with +1 if it adds material and -1 if it removes it"""
+    kind = tree[0]
+    if kind == "fuse":
+        return [leaf for child in tree[1] for leaf in primitives(child)]
+    if kind == "cut":
+        return primitives(tree[1]) + [(leaf, -sign) for leaf, sign in primitives(tree[2])]
+    return [(tree, 1)]
+
+def part_key(tree):
+    """Stable hash of a part's geometry"""
+    return hashlib.blake2b(repr(tree).encode(), digest_size=16).hexdigest()
+
+# Parts of the cow, mirroring the original FreeCAD macro
+
+def leg(placement, length=30, upper_radius=5, lower_radius=3):
+    """Front leg hanging from placement: thigh, knee, cannon, fetlock, pastern and split hoof"""
+    x, y, z = placement
+    hoof_z = z - length * 0.92
+    hoof = cut(ellipsoid((x, y, hoof_z), (lower_radius * 1.5, lower_radius * 2, lower_radius * 0.8)),
+               box(lower_radius * 0.5, lower_radius * 4, lower_radius * 2,
+                   (x - lower_radius * 0.25, y - lower_radius * 2, hoof_z - lower_radius)))
+    return fuse(
+        cylinder(upper_radius, length * 0.3, placement),
+        ellipsoid((x, y, z - length * 0.3), (upper_radius * 1.1, upper_radius * 1.1, upper_radius * 0.9)),
+        cylinder(lower_radius, length * 0.4, (x, y, z - length * 0.32)),
+        ellipsoid((x, y, z - length * 0.73), (lower_radius * 1.2, lower_radius * 1.2, lower_radius * 0.8)),
+        cylinder(lower_radius * 0.9, length * 0.15, (x, y, z - length * 0.75)),
+        hoof,
+    )
+
+def back_leg(placement, length=35):
+    """Back leg with angled thigh and shin"""
+    upper_radius, lower_radius = 6, 3.5
+    x, y, z = placement
+    knee = (x + length * 0.035, y, z - length * 0.35)
+    lower = (knee[0] - length * 0.02, y, knee[2] - length * 0.02)
+    ankle = (lower[0] - length * 0.03, y, lower[2] - length * 0.63)
+    hoof_center = (ankle[0], y, ankle[2] - lower_radius * 2)
+    hoof = cut(ellipsoid(hoof_center, (lower_radius * 1.5, lower_radius * 2, lower_radius * 0.8)),
+               box(lower_radius * 0.5, lower_radius * 4, lower_radius * 2,
+                   (hoof_center[0] - lower_radius * 0.25, y - lower_radius * 2, hoof_center[2] - lower_radius)))
+    return fuse(
+        cylinder(upper_radius, length * 0.35, placement, (0.1, 0, -1)),
+        ellipsoid(knee, (upper_radius * 1.2, upper_radius * 1.2, upper_radius)),
+        cylinder(lower_radius, length * 0.65, lower, (-0.05, 0, -1)),
+        ellipsoid(ankle, (lower_radius * 1.3, lower_radius * 1.3, lower_radius * 0.9)),
+        hoof,
+    )
+
+def body(p):
+    L, W, H, zc = p["body_length"], p["body_width"], p["body_height"], p["body_center_z"]
+    return fuse(
+        ellipsoid((0, 0, zc), (L / 2, W / 2, H / 2)),
+        ellipsoid((L / 2 - 10, 0, zc - 2), (L / 8, W / 2.1, H / 1.9)),
+        ellipsoid((-L / 2 + 15, 0, zc), (L / 7, W / 1.9, H / 2.1)),
+        ellipsoid((0, 0, zc + H / 2 - 2), (L / 2 - 10, 5, 3)),
+    )
+
+def neck(p):
+    """Tapering ellipsoids along a quadratic Bezier curve, plus the dewlap"""
+    L, H, zc, steps = p["body_length"], p["body_height"], p["body_center_z"], p["neck_steps"]
+    base = np.array([L / 2 - 5, 0, zc + 5])
+    control = np.array([L / 2 + 5, 0, zc + H / 2 + 5])
+    top = np.array([L / 2 + 8, 0, zc + H / 2 + 15])
+    sections = []
+    for i in range(steps):
+        t = i / (steps - 1)
+        center = (1 - t) ** 2 * base + 2 * (1 - t) * t * control + t ** 2 * top
+        radius = 12 - 4 * t
+        sections.append(ellipsoid(center, (radius, radius, 4 + 2 * t)))
+    return fuse(*sections, ellipsoid((L / 2, 0, zc - 5), (15, 10, 12)))
+
+def head_center(p):
+    return (p["body_length"] / 2 + 20, 0.0, p["body_center_z"] + p["body_height"] / 2 + 25)
+
+def snout_center(p):
+    hx, hy, hz = head_center(p)
+    return (hx + 15, 0.0, hz - 5)
+
+def head(p):
+    hx, hy, hz = head_center(p)
+    return fuse(ellipsoid((hx, hy, hz), (18, 14, 14)), ellipsoid((hx - 2, hy, hz + 7), (10, 8, 5)))
+
+def snout(p):
+    sx, sy, sz = snout_center(p)
+    return fuse(ellipsoid((sx, sy, sz), (12, 9, 7)), ellipsoid((sx + 8, 0, sz), (4, 7, 6)))
+
+def ear(p, side):
+    """Ear on the left (side=+1) or right (side=-1)"""
+    hx, hy, hz = head_center(p)
+    cx, cy, cz = hx - 8, hy + side * 15, hz + 8
+    return fuse(ellipsoid((cx, cy, cz), (5, 3, 8)), ellipsoid((cx, cy + side * 5, cz + 5), (8, 2, 10)))
+
+def eye(p, side):
+    hx, hy, hz = head_center(p)
+    return ellipsoid((hx + 12, hy + side * 9, hz + 3), (2.5, 1.5, 1.5))
+
+def nostril(p, side):
+    sx, sy, sz = snout_center(p)
+    center = (sx + 10, sy + side * 3.5, sz)
+    return cut(ellipsoid(center, (1, 2, 1.5)), ellipsoid(center, (0.8, 1.8, 1.3)))
+
+def mouth(p):
+    sx, sy, sz = snout_center(p)
+    return box(8, 12, 0.5, (sx + 4, -6, sz - 3), fillet=0.2)
+
+def tail(p):
+    """S-shaped chain of tapering cylinders ending in a tuft"""
+    L, zc = p["body_length"], p["body_center_z"]
+    sections, section_length = p["tail_sections"], p["tail_section_length"]
+    total_length = section_length * sections
+    bx, by, bz = -L / 2 + 2, 0.0, zc + 2
+    pieces = []
+    for i in range(sections):
+        t = i / (sections - 1)
+        angle = t * math.pi * 0.8
+        last = i == sections - 1
+        radius = 2.5 if last else 3 - 1.8 * i / (sections - 1)
+        direction = (0, 0, 1) if last else (-math.cos(angle), 0, math.sin(angle))
+        base = (bx - total_length * 0.6 * t, by, bz + total_length * 0.3 * math.sin(angle))
+        pieces.append(cylinder(radius, section_length * 0.95, base, direction))
+    pieces.append(ellipsoid((bx - total_length * 0.6, by, bz + total_length * 0.05), (4, 4, 5)))
+    return fuse(*pieces)
+
+def udder(p):
+    L, H, zc = p["body_length"], p["body_height"], p["body_center_z"]
+    ux, uz = -L / 3, zc - H / 2 + 5
+    teats = []
+    for dx, y, dz in [(-6, 5, -3), (-6, -5, -3), (2, 5, -3), (2, -5, -3)]:
+        x, z = -L / 3 + dx, zc - H / 2 + dz
+        teats.append(fuse(cylinder(2, 3, (x, y, z)), cylinder(1.5, 2, (x, y, z - 3)),
+                          ellipsoid((x, y, z - 5), (1.5, 1.5, 1))))
+    return fuse(cut(ellipsoid((ux, 0, uz), (12, 11, 10)), box(1, 22, 12, (ux, -11, uz - 6))), *teats)
+
+def navel(p):
+    return ellipsoid((p["body_length"] / 6, 0, p["body_center_z"] - p["body_height"] / 2 + 3), (5, 3, 1.5))
+
+def shoulder_muscle(p):
+    L, W, H, zc = p["body_length"], p["body_width"], p["body_height"], p["body_center_z"]
+    return ellipsoid((L / 3, 0, zc + 5), (L / 8, W / 2.2, H / 2.5))
+
+def hip_muscle(p):
+    L, W, H, zc = p["body_length"], p["body_width"], p["body_height"], p["body_center_z"]
+    return ellipsoid((-L / 3, 0, zc + 5), (L / 7, W / 2.2, H / 2.5))
+
+def back_ridge(p):
+    L, H, zc = p["body_length"], p["body_height"], p["body_center_z"]
+    return ellipsoid((0, 0, zc + H / 2 - 1), (L * 0.35, 2.5, 1.5))
+
+def cow_parts(parameters=None):
+    """{name: (tree, color)} for every part of the realistic cow, in document order"""
+    p = dict(DEFAULT_PARAMETERS, **(parameters or {}))
+    L, W, H, zc = p["body_length"], p["body_width"], p["body_height"], p["body_center_z"]
+    hip_z = zc - H / 2
+    return {
+        "Body": (body(p), BROWN),
+        "Neck": (neck(p), BROWN),
+        "Head": (head(p), BROWN),
+        "Snout": (snout(p), BROWN),
+        "LeftEar": (ear(p, 1), BROWN),
+        "RightEar": (ear(p, -1), BROWN),
+        "LeftEye": (eye(p, 1), EYE),
+        "RightEye": (eye(p, -1), EYE),
+        "LeftNostril": (nostril(p, 1), DARK_BROWN),
+        "RightNostril": (nostril(p, -1), DARK_BROWN),
+        "Mouth": (mouth(p), DARK_BROWN),
+        "FrontLeftLeg": (leg((L / 2 - 15, W / 2 - 3, hip_z), p["leg_length"]), BROWN),
+        "FrontRightLeg": (leg((L / 2 - 15, -W / 2 + 3, hip_z), p["leg_length"]), BROWN),
+        "BackLeftLeg": (back_leg((-L / 2 + 18, W / 2 - 3, hip_z), p["back_leg_length"]), BROWN),
+        "BackRightLeg": (back_leg((-L / 2 + 18, -W / 2 + 3, hip_z), p["back_leg_length"]), BROWN),
+        "Tail": (tail(p), BROWN),
+        "Udder": (udder(p), UDDER),
+        "Navel": (navel(p), DARK_BROWN),
+        "ShoulderMuscle": (shoulder_muscle(p), BROWN),
+        "HipMuscle": (hip_muscle(p), BROWN),
+        "BackRidge": (back_ridge(p), BROWN),
+    }
+
+# Point membership, vectorized over points
+
+def inside(tree, points):
+    """Boolean mask of the points (shape (..., 3)) inside the solid of the tree"""
+    points = np.asarray(points, dtype=float)
+    kind = tree[0]
+    if kind == "ellipsoid":
+        _, center, radii = tree
+        return np.sum(((points - center) / radii) ** 2, axis=-1) <= 1
+    if kind == "cylinder":
+        _, base, direction, radius, height = tree
+        d = points - base
+        s = d @ np.asarray(direction)
+        radial = np.sum(d * d, axis=-1) - s * s
+        return (s >= 0) & (s <= height) & (radial <= radius * radius)
+    if kind == "box":
+        _, corner, size, _ = tree
+        return np.all((points >= corner) & (points <= np.add(corner, size)), axis=-1)
+    if kind == "fuse":
+        mask = np.zeros(points.shape[:-1], dtype=bool)
+        for child in tree[1]:
+            mask |= inside(child, points)
+        return mask
+    if kind == "cut":
+        return inside(tree[1], points) & ~inside(tree[2], points)
+    raise ValueError(f"Unknown geometry node {kind!r}")
+
+# Headless tessellation
+
+def _grid_triangles(rows, cols, wrap=False):
+    """Two triangles per cell of a rows x cols vertex grid (columns wrap around if asked)"""
+    c = cols if wrap else cols - 1
+    i, j = np.meshgrid(np.arange(rows - 1), np.arange(c), indexing="ij")
+    a = i * cols + j
+    b = i * cols + (j + 1) % cols
+    return np.concatenate([np.stack([a, b, b + cols], -1).reshape(-1, 3),
+                           np.stack([a, b + cols, a + cols], -1).reshape(-1, 3)])
+
+def _primitive_mesh(leaf, resolution):
+    """(vertices, triangles) of a primitive's surface"""
+    kind = leaf[0]
+    if kind == "ellipsoid":
+        _, center, radii = leaf
+        theta = np.linspace(0, np.pi, resolution + 1)
+        phi = np.linspace(0, 2 * np.pi, 2 * resolution, endpoint=False)
+        T, P = np.meshgrid(theta, phi, indexing="ij")
+        unit = np.stack([np.sin(T) * np.cos(P), np.sin(T) * np.sin(P), np.cos(T)], -1).reshape(-1, 3)
+        return center + unit * radii, _grid_triangles(resolution + 1, 2 * resolution, wrap=True)
+    if kind == "cylinder":
+        _, base, direction, radius, height = leaf
+        u = np.asarray(direction)
+        e1 = np.cross(u, [1.0, 0, 0] if abs(u[0]) < 0.9 else [0, 1.0, 0])
+        e1 /= np.linalg.norm(e1)
+        e2 = np.cross(u, e1)
+        n = 2 * resolution
+        phi = np.linspace(0, 2 * np.pi, n, endpoint=False)
+        ring = radius * (np.cos(phi)[:, None] * e1 + np.sin(phi)[:, None] * e2)
+        rows = max(2, resolution // 4 + 1)
+        s = np.linspace(0, height, rows)
+        side = (base + s[:, None, None] * u + ring[None]).reshape(-1, 3)
+        bottom, top = np.asarray(base), base + height * u
+        # The caps get their own rim vertices, so vertex normals do not blend across the edge
+        vertices = np.vstack([side, bottom + ring, top + ring, bottom, top])
+        k = np.arange(n)
+        b0, t0 = len(side), len(side) + n
+        c0, c1 = t0 + n, t0 + n + 1
+        triangles = np.vstack([
+            _grid_triangles(rows, n, wrap=True),
+            np.column_stack([np.full(n, c0), b0 + (k + 1) % n, b0 + k]),
+            np.column_stack([np.full(n, c1), t0 + k, t0 + (k + 1) % n]),
+        ])
+        return vertices, triangles
+    if kind == "box":
+        _, corner, size, _ = leaf
+        k = max(2, resolution // 8 + 1)
+        t = np.linspace(0, 1, k)
+        A, B = np.meshgrid(t, t, indexing="ij")
+        vertices, triangles = [], []
+        for axis in range(3):
+            a1, a2 = (axis + 1) % 3, (axis + 2) % 3
+            for side in (0, 1):
+                face = np.empty((k * k, 3))
+                face[:, axis] = corner[axis] + side * size[axis]
+                face[:, a1] = corner[a1] + A.ravel() * size[a1]
+                face[:, a2] = corner[a2] + B.ravel() * size[a2]
+                triangles.append(_grid_triangles(k, k) + sum(len(v) for v in vertices))
+                vertices.append(face)
+        return np.vstack(vertices), np.vstack(triangles)
+    raise ValueError(f"Unknown primitive {kind!r}")
+
+def _surface_samples(leaf, centroids, normals):
+    """Points on the exact surface of a primitive next to the triangle centroids, and the
+    outward surface normals there (a curved surface bulges past its flat triangles)"""
+    kind = leaf[0]
+    if kind == "ellipsoid":
+        _, center, radii = leaf
+        q = (centroids - center) / radii
+        q /= np.linalg.norm(q, axis=1, keepdims=True)
+        n = q / radii
+        return center + q * radii, n / np.linalg.norm(n, axis=1, keepdims=True)
+    if kind == "cylinder":
+        _, base, direction, radius, height = leaf
+        u = np.asarray(direction)
+        d = centroids - base
+        s = d @ u
+        radial = d - s[:, None] * u
+        r = np.linalg.norm(radial, axis=1, keepdims=True)
+        # Cap triangles lie in their planes already; side triangles move out to the radius
+        cap = np.abs(normals @ u) > 0.5
+        points = np.where(cap[:, None], centroids, base + s[:, None] * u + radius * radial / np.maximum(r, 1e-300))
+        outward = np.where(cap[:, None], np.sign(s - height / 2)[:, None] * u, radial / np.maximum(r, 1e-300))
+        return points, outward
+    # Box faces are flat; the outward normal points away from the box centre
+    _, corner, size, _ = leaf
+    away = np.sign(np.sum(normals * (centroids - (np.asarray(corner) + np.asarray(size) / 2)), axis=1))
+    return centroids, normals * away[:, None]
+
+def _tessellate(tree, resolution):
+    """Boundary of the solid from the primitives' surfaces.
+
+    A triangle lies on the boundary when the solid is on exactly one side of the
+    primitive's surface at the triangle. Triangles with the solid on their outer
+    side (the walls of cuts) are flipped, and triangles inside other primitives, or
+    outside the base of a cut, drop out, so overlapping primitives leave no
+    internal faces.
+    """
+    vertices, triangles, offset = [], [], 0
+    points, outward = [], []
+    for leaf, _ in primitives(tree):
+        v, t = _primitive_mesh(leaf, resolution)
+        corners = v[t]
+        normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        area = np.linalg.norm(normals, axis=1)
+        t, corners, normals = t[area > 0], corners[area > 0], normals[area > 0] / area[area > 0, None]
+        p, n = _surface_samples(leaf, corners.mean(axis=1), normals)
+        # Wind every triangle counter-clockwise seen from outside its primitive
+        t = np.where((np.sum(normals * n, axis=1) < 0)[:, None], t[:, ::-1], t)
+        vertices.append(v)
+        triangles.append(t + offset)
+        points.append(p)
+        outward.append(n)
+        offset += len(v)
+    vertices, triangles = np.vstack(vertices), np.vstack(triangles)
+    points, outward = np.vstack(points), np.vstack(outward)
+
+    eps = 1e-6 * np.ptp(vertices, axis=0).max()
+    outer = inside(tree, points + eps * outward)
+    inner = inside(tree, points - eps * outward)
+    keep = outer != inner
+    triangles = np.where(outer[:, None], triangles[:, ::-1], triangles)[keep]
+
+    used, triangles = np.unique(triangles, return_inverse=True)
+    return vertices[used], triangles.reshape(-1, 3).astype(np.int32)
+
+# Disk memoization
+
+def _cache_path(key, suffix, cache_dir=None):
+    cache_dir = CACHE_DIR if cache_dir is None else cache_dir
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, f"{key}-v{CACHE_VERSION}{suffix}")
+
+def tessellate(tree, resolution=32, cache_dir=None):
+    """(vertices, triangles) of a part's surface, memoized on disk per geometry and resolution"""
+    path = _cache_path(part_key(tree), f"-mesh{resolution}.npz", cache_dir)
+    if os.path.exists(path):
+        with np.load(path) as data:
+            return data["vertices"], data["triangles"]
+    vertices, triangles = _tessellate(tree, resolution)
+    tmp = path + f".{os.getpid()}.npz"
+    np.savez(tmp, vertices=vertices, triangles=triangles)
+    os.replace(tmp, path)
+    return vertices, triangles
+
+def assembled_mesh(trees, resolution=32, cache_dir=None):
+    """Tessellations of several parts concatenated into one (vertices, triangles) mesh"""
+    meshes = [tessellate(tree, resolution, cache_dir) for tree in trees]
+    offsets = np.cumsum([0] + [len(v) for v, _ in meshes[:-1]])
+    return (np.vstack([v for v, _ in meshes]),
+            np.vstack([t + offset for (_, t), offset in zip(meshes, offsets)]).astype(np.int32))
+
+def _make_shape(tree):
+    import FreeCAD as App
+    import Part
+    kind = tree[0]
+    if kind == "ellipsoid":
+        _, center, radii = tree
+        mat = App.Matrix()
+        mat.scale(*radii)
+        shape = Part.makeSphere(1.0).transformGeometry(mat)
+        shape.translate(App.Vector(*center))
+        return shape
+    if kind == "cylinder":
+        _, base, direction, radius, height = tree
+        return Part.makeCylinder(radius, height, App.Vector(*base), App.Vector(*direction))
+    if kind == "box":
+        _, corner, size, fillet = tree
+        shape = Part.makeBox(*size, App.Vector(*corner))
+        return shape.makeFillet(fillet, shape.Edges) if fillet else shape
+    if kind == "fuse":
+        shape = _make_shape(tree[1][0])
+        for child in tree[1][1:]:
+            shape = shape.fuse(_make_shape(child))
+        return shape
+    if kind == "cut":
+        return _make_shape(tree[1]).cut(_make_shape(tree[2]))
+    raise ValueError(f"Unknown geometry node {kind!r}")
+
+def build_shape(tree, cache_dir=None):
+    """OpenCascade shape of a part (needs FreeCAD), memoized on disk as a BREP file"""
+    import Part
+    path = _cache_path(part_key(tree), ".brep", cache_dir)
+    if os.path.exists(path):
+        shape = Part.Shape()
+        shape.importBrep(path)
+        return shape
+    shape = _make_shape(tree)
+    tmp = path + f".{os.getpid()}.brep"
+    shape.exportBrep(tmp)
+    os.replace(tmp, path)
+    return shape
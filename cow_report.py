@@ -0,0 +1,222 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from cow_drag import drag_force, projected_areas
+from cow_geometry import DEFAULT_PARAMETERS, assembled_mesh, cow_parts
+from cow_mass import combine, mass_properties, surface_area
+
+# Comparison of realistic and spherical cows as a columnar results table.
+#
+# A table is a dict of equally long numpy columns, one row per design variant:
+# the parameters followed by the metrics of comparison_row(). Tables are written in
+# bulk (write_table), the report figures are rendered in worker processes with the
+# non-interactive Agg backend (render_plots), and a FreeCAD spreadsheet is an
+# optional view of one row, filled by a single import (fill_sheet).
+
+# Parts counted in the volume, area and mass comparison; the small details are left out
+MAIN_PARTS = ("Body", "Neck", "Head", "Snout", "LeftEar", "RightEar",
+              "FrontLeftLeg", "FrontRightLeg", "BackLeftLeg", "BackRightLeg", "Tail", "Udder")
+
+DENSITY = 1000e-9  # kg/mm³ (1000 kg/m³)
+VELOCITIES = np.array([1, 5, 10, 15, 20])  # m/s
+FLUID_DENSITY = 1.225  # kg/m³ (air at sea level)
+DRAG_COEFFICIENT = 0.8  # Approximate for cow-like shape
+
+PLOTS = ("drag", "ratio", "moi")
+
+def comparison_row(realistic_volume, realistic_surface_area, projected, mass, inertia):
+    """Metrics of one variant (mm, kg) from the realistic cow's properties.
+
+    projected holds the frontal, side and top areas and inertia the moments about
+    the x, y and z axes through the centroid. The spherical cow has the same volume.
+    """
+    radius = (3 * realistic_volume / (4 * np.pi)) ** (1 / 3)
+    spherical_volume = 4 / 3 * np.pi * radius ** 3
+    spherical_surface_area = 4 * np.pi * radius ** 2
+    spherical_mass = spherical_volume * DENSITY
+    return {
+        "realistic_volume": realistic_volume,
+        "spherical_volume": spherical_volume,
+        "realistic_surface_area": realistic_surface_area,
+        "spherical_surface_area": spherical_surface_area,
+        "realistic_sa_to_vol": realistic_surface_area / realistic_volume,
+        "spherical_sa_to_vol": spherical_surface_area / spherical_volume,
+        "realistic_frontal_area": projected[0],
+        "realistic_side_area": projected[1],
+        "realistic_top_area": projected[2],
+        "spherical_projected_area": np.pi * radius ** 2,
+        "realistic_mass": mass,
+        "spherical_mass": spherical_mass,
+        "realistic_moi_x": inertia[0],
+        "realistic_moi_y": inertia[1],
+        "realistic_moi_z": inertia[2],
+        "spherical_moi": 2 / 5 * spherical_mass * radius ** 2,
+        "sphere_radius": radius,
+        "heat_dissipation_ratio": spherical_surface_area / realistic_surface_area,
+    }
+
+def evaluate(parameters=None, resolution=16):
+    """Parameters and comparison_row() metrics of one variant, computed headless"""
+    p = dict(DEFAULT_PARAMETERS, **(parameters or {}))
+    parts = cow_parts(p)
+    realistic = combine([mass_properties(parts[name][0], DENSITY) for name in MAIN_PARTS])
+    vertices, triangles = assembled_mesh([tree for tree, _ in parts.values()], resolution)
+    row = comparison_row(realistic.volume, sum(surface_area(parts[name][0]) for name in MAIN_PARTS),
+                         projected_areas(vertices, triangles, np.eye(3)), realistic.mass,
+                         realistic.inertia.diagonal())
+    return {**p, **row}
+
+def table_from_rows(rows):
+    """Columnar table from a list of {column: scalar} rows"""
+    return {name: np.array([row[name] for row in rows]) for name in rows[0]}
+
+def write_table(table, path):
+    """Write the table in one go: .csv (text), .npz (one array per column) or .parquet (needs pyarrow)"""
+    extension = os.path.splitext(path)[1]
+    if extension == ".csv":
+        np.savetxt(path, np.column_stack(list(table.values())), fmt="%.10g", delimiter=",",
+                   header=",".join(table), comments="")
+    elif extension == ".npz":
+        np.savez(path, **table)
+    elif extension == ".parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        pq.write_table(pa.table(table), path)
+    else:
+        raise ValueError(f"Unknown table format {extension!r}, expected .csv, .npz or .parquet")
+    return path
+
+def read_table(path):
+    """Table written by write_table as .csv or .npz"""
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+    data = np.genfromtxt(path, delimiter=",", names=True)
+    return {name: np.atleast_1d(data[name]) for name in data.dtype.names}
+
+# Plotting, in worker processes
+
+def _init_plotting():
+    import matplotlib
+    matplotlib.use("Agg", force=True)
+
+def _plot(job):
+    """Render one figure of one row; job is (kind, row, path, velocities)"""
+    import matplotlib.pyplot as plt
+    kind, row, path, velocities = job
+    fig, ax = plt.subplots(figsize=(10, 6) if kind != "ratio" else (8, 5))
+    if kind == "drag":
+        areas = np.array([row["realistic_frontal_area"], row["realistic_side_area"],
+                          row["realistic_top_area"], row["spherical_projected_area"]]) * 1e-6  # mm² to m²
+        drag = drag_force(velocities, areas, FLUID_DENSITY, DRAG_COEFFICIENT)
+        for curve, style, label in zip(drag.T, ["b-", "g-", "r-", "k--"],
+                                       ["Realistic Cow (Front)", "Realistic Cow (Side)", "Realistic Cow (Top)",
+                                        "Spherical Cow (All directions)"]):
+            ax.plot(velocities, curve, style, label=label)
+        ax.set_xlabel("Velocity (m/s)")
+        ax.set_ylabel("Drag Force (N)")
+        ax.set_title("Drag Force vs Velocity")
+        ax.grid(True)
+        ax.legend()
+    elif kind == "ratio":
+        ax.bar(["Realistic Cow", "Spherical Cow"], [row["realistic_sa_to_vol"], row["spherical_sa_to_vol"]])
+        ax.set_ylabel("Surface Area to Volume Ratio (mm⁻¹)")
+        ax.set_title("Surface Area to Volume Ratio Comparison")
+        ax.grid(True, axis="y")
+    elif kind == "moi":
+        x = np.arange(3)
+        width = 0.35
+        ax.bar(x - width / 2, [row["realistic_moi_x"], row["realistic_moi_y"], row["realistic_moi_z"]], width,
+               label="Realistic Cow")
+        ax.bar(x + width / 2, [row["spherical_moi"]] * 3, width, label="Spherical Cow")
+        ax.set_xlabel("Rotation Axis")
+        ax.set_ylabel("Moment of Inertia (kg·mm²)")
+        ax.set_title("Moment of Inertia Comparison")
+        ax.set_xticks(x, ["X-axis", "Y-axis", "Z-axis"])
+        ax.legend()
+        ax.grid(True, axis="y")
+    else:
+        plt.close(fig)
+        raise ValueError(f"Unknown plot {kind!r}, expected one of {PLOTS}")
+    fig.savefig(path)
+    plt.close(fig)
+    return path
+
+def render_plots(table, directory, rows=None, kinds=PLOTS, prefix="", velocities=VELOCITIES, workers=None):
+    """Render the report figures of the given rows (all by default) as PNG files.
+
+    Files are named {prefix}{kind}_plot.png for a single row and
+    {prefix}{row:04d}_{kind}_plot.png otherwise. With workers != 1 the figures are
+    drawn in a process pool (workers=None: one per CPU); where processes are
+    spawned rather than forked, a pool started from inside FreeCAD would launch
+    FreeCAD again, so pass workers=1 there. Returns {(row, kind): path}.
+    """
+    rows = range(len(next(iter(table.values())))) if rows is None else rows
+    jobs, keys = [], []
+    for i in rows:
+        row = {name: column[i] for name, column in table.items()}
+        for kind in kinds:
+            name = f"{prefix}{kind}_plot.png" if len(rows) == 1 else f"{prefix}{i:04d}_{kind}_plot.png"
+            jobs.append((kind, row, os.path.join(directory, name), np.asarray(velocities)))
+            keys.append((i, kind))
+    os.makedirs(directory, exist_ok=True)
+    if workers == 1 or len(jobs) == 1:
+        _init_plotting()
+        paths = [_plot(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_plotting) as pool:
+            paths = list(pool.map(_plot, jobs))
+    return dict(zip(keys, paths))
+
+# FreeCAD spreadsheet view
+
+# (row, label, realistic column, spherical column, alias stem, digits) of the sheet;
+# the ratio column D is spherical / realistic
+SHEET_LAYOUT = [
+    (2, "Volume (mm³)", "realistic_volume", "spherical_volume", "volume", 2),
+    (3, "Surface Area (mm²)", "realistic_surface_area", "spherical_surface_area", "surface_area", 2),
+    (4, "Surface/Volume Ratio (mm⁻¹)", "realistic_sa_to_vol", "spherical_sa_to_vol", "sa_vol_ratio", 4),
+    (5, "Frontal Area (mm²)", "realistic_frontal_area", "spherical_projected_area", "frontal_area", 2),
+    (6, "Side Area (mm²)", "realistic_side_area", "spherical_projected_area", "side_area", 2),
+    (7, "Top Area (mm²)", "realistic_top_area", "spherical_projected_area", "top_area", 2),
+    (9, "Mass (kg)", "realistic_mass", "spherical_mass", "mass", 2),
+    (10, "Moment of Inertia X (kg·mm²)", "realistic_moi_x", "spherical_moi", "moi_x", 4),
+    (11, "Moment of Inertia Y (kg·mm²)", "realistic_moi_y", "spherical_moi", "moi_y", 4),
+    (12, "Moment of Inertia Z (kg·mm²)", "realistic_moi_z", "spherical_moi", "moi_z", 4),
+]
+
+def _sheet_aliases():
+    """(cell, alias) pairs of the sheet, as the original macro named them"""
+    aliases = []
+    for r, _, _, _, stem, _ in SHEET_LAYOUT:
+        ratio = "sa_vol_ratio_comparison" if stem == "sa_vol_ratio" else f"{stem}_ratio"
+        aliases += [(f"B{r}", f"realistic_cow_{stem}"), (f"C{r}", f"spherical_cow_{stem}"), (f"D{r}", ratio)]
+    return aliases + [("C14", "heat_dissipation_ratio")]
+
+def fill_sheet(sheet, table, row=0, path=None):
+    """Fill a FreeCAD Spreadsheet::Sheet with one row of the table, in one importFile call.
+
+    The cells are written to a tab-separated file (path, or next to the document's
+    temporary files) and imported at once; aliases and styles follow.
+    """
+    values = {name: column[row] for name, column in table.items()}
+    grid = [["Property", "Realistic Cow", "Spherical Cow", "Ratio (Spherical/Realistic)"]]
+    grid += [["", "", "", ""] for _ in range(13)]
+    for r, label, realistic, spherical, _, digits in SHEET_LAYOUT:
+        grid[r - 1] = [label, str(round(values[realistic], digits)), str(round(values[spherical], digits)),
+                       str(round(values[spherical] / values[realistic], 4))]
+    grid[13] = ["Heat Dissipation Ratio", "", str(round(values["heat_dissipation_ratio"], 4)), ""]
+    if path is None:
+        import FreeCAD as App
+        path = os.path.join(App.getTempPath(), f"{sheet.Name}.tsv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join("\t".join(line) for line in grid) + "\n")
+    sheet.importFile(path, "\t")
+
+    for cell, alias in _sheet_aliases():
+        sheet.setAlias(cell, alias)
+    sheet.setStyle("A1:A14", "bold|italic", "add")
+    sheet.setStyle("A1:D1", "bold|underline", "add")
+    for column, width in zip("ABCD", (200, 150, 150, 200)):
+        sheet.setColumnWidth(column, width)
+    return sheet
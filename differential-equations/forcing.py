@@ -0,0 +1,97 @@
+import math
+from abc import ABC, abstractmethod
+import numpy as np
+
+# Forcing functions for ODE right-hand sides. Every Forcing can be called with a
+# scalar time (the per-evaluation path used by odeint) or with an array of times,
+# and sample(t) evaluates it over a whole time grid at once, which is what the
+# exact and batched solvers use. They are plain callables, so they also work as
+# the input of first_order_system in the Fourier/Laplace scripts.
+
+class Forcing(ABC):
+    @abstractmethod
+    def __call__(self, t):
+        """Value at a scalar time, or values at an array of times"""
+
+    def sample(self, t):
+        """Values on the time grid t, as an array"""
+        return np.broadcast_to(np.asarray(self(np.asarray(t, dtype=float)), dtype=float), np.shape(t))
+
+class SampledForcing(Forcing):
+    """Piecewise-linear interpolation of samples, held constant outside their range.
+
+    The slope of every interval is tabulated up front. On a uniform grid the
+    interval is found by index arithmetic instead of a search.
+    """
+
+    def __init__(self, t, values):
+        self.t = np.asarray(t, dtype=float)
+        self.values = np.asarray(values, dtype=float)
+        self.slopes = np.diff(self.values) / np.diff(self.t)
+        dt = np.diff(self.t)
+        self.uniform = np.allclose(dt, dt[0], rtol=1e-9, atol=0)
+        self.t0 = self.t[0]
+        self.inv_dt = 1 / dt[0]
+        # Python lists make the scalar path free of numpy call overhead
+        self._values = self.values.tolist()
+        self._slopes = self.slopes.tolist()
+
+    def __call__(self, t):
+        if isinstance(t, float) and self.uniform:
+            i = min(max(int((t - self.t0) * self.inv_dt), 0), len(self._slopes) - 1)
+            s = min(max(t - self.t0 - i / self.inv_dt, 0.0), 1 / self.inv_dt)
+            return self._values[i] + self._slopes[i] * s
+        return np.interp(t, self.t, self.values)
+
+    def sample(self, t):
+        t = np.asarray(t, dtype=float)
+        if t.shape == self.t.shape and np.array_equal(t, self.t):
+            return self.values
+        return np.interp(t, self.t, self.values)
+
+class SinusoidForcing(Forcing):
+    """offset + sum of amplitude * sin(2*pi*frequency*t + phase), frequencies in Hz"""
+
+    def __init__(self, amplitude=(), frequency=(), phase=0.0, offset=0.0):
+        self.amplitude, self.frequency, self.phase = (
+            np.atleast_1d(np.asarray(a, dtype=float)) for a in np.broadcast_arrays(amplitude, frequency, phase))
+        self.offset = float(offset)
+        self._terms = list(zip(self.amplitude.tolist(), (2 * np.pi * self.frequency).tolist(), self.phase.tolist()))
+
+    def __call__(self, t):
+        if isinstance(t, float):
+            return self.offset + sum(a * math.sin(w * t + p) for a, w, p in self._terms)
+        t = np.asarray(t, dtype=float)
+        angles = np.multiply.outer(t, 2 * np.pi * self.frequency) + self.phase
+        return self.offset + np.sin(angles) @ self.amplitude
+
+class CallableForcing(Forcing):
+    """Any function of t. sample() tries one array call and falls back to one call per time."""
+
+    def __init__(self, f):
+        self.f = f
+
+    def __call__(self, t):
+        return self.f(t)
+
+    def sample(self, t):
+        t = np.asarray(t, dtype=float)
+        try:
+            values = np.asarray(self.f(t), dtype=float)
+            return np.broadcast_to(values, t.shape)
+        except (TypeError, ValueError):
+            return np.array([self.f(s) for s in t.tolist()], dtype=float)
+
+def as_forcing(f):
+    """Wrap a callable, a (t, values) pair, a sinusoid spec dict or a constant as a Forcing"""
+    if isinstance(f, Forcing):
+        return f
+    if callable(f):
+        return CallableForcing(f)
+    if isinstance(f, dict):
+        return SinusoidForcing(**f)
+    if isinstance(f, tuple) and len(f) == 2:
+        return SampledForcing(*f)
+    if np.ndim(f) == 0:
+        return SinusoidForcing(offset=f)
+    raise TypeError("Forcing must be a callable, a (t, values) pair, a sinusoid spec dict or a constant")
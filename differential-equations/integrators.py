@@ -0,0 +1,203 @@
+import numpy as np
+
+# Fixed-step and adaptive Runge-Kutta integrators for batches of ODE systems.
+#
+# The right-hand side is called as rhs(t, y, *args, out=dydt) and writes the
+# derivative into the preallocated buffer dydt. y may hold a single state,
+# shape (n_states,), or a batch of them, shape (n_trajectories, n_states), so
+# one call advances every trajectory at once.
+
+def rk4(rhs, y0, t, args=(), every=1):
+    """Classic fourth-order Runge-Kutta over the time grid t.
+
+    Returns the states at t[::every], shape (len(t[::every]),) + y0.shape.
+    All stages reuse the same buffers, so no arrays are allocated per step.
+    """
+    y = np.array(y0, dtype=float)
+    k1, k2, k3, k4, tmp = (np.empty_like(y) for _ in range(5))
+    sol = np.empty((len(t[::every]),) + y.shape)
+    sol[0] = y
+
+    for i in range(len(t) - 1):
+        h = t[i+1] - t[i]
+        rhs(t[i], y, *args, out=k1)
+        np.multiply(k1, h / 2, out=tmp)
+        tmp += y
+        rhs(t[i] + h/2, tmp, *args, out=k2)
+        np.multiply(k2, h / 2, out=tmp)
+        tmp += y
+        rhs(t[i] + h/2, tmp, *args, out=k3)
+        np.multiply(k3, h, out=tmp)
+        tmp += y
+        rhs(t[i] + h, tmp, *args, out=k4)
+
+        # y += h/6 * (k1 + 2*k2 + 2*k3 + k4)
+        k2 += k3
+        k2 *= 2
+        k1 += k2
+        k1 += k4
+        k1 *= h / 6
+        y += k1
+        if (i + 1) % every == 0:
+            sol[(i + 1) // every] = y
+
+    return sol
+
+# Dormand-Prince 5(4) coefficients
+DP_C = np.array([0, 1/5, 3/10, 4/5, 8/9, 1, 1])
+DP_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+    [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84],
+]
+DP_B = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0])
+DP_E = DP_B - np.array([5179/57600, 0, 7571/16695, 393/640, -92097/339200, 187/2100, 1/40])
+# Continuous extension: y(t + theta*h) = y + h * sum_j k_j * sum_m DP_P[j, m] * theta**(m+1)
+DP_P = np.array([
+    [1, -8048581381/2820520608, 8663915743/2820520608, -12715105075/11282082432],
+    [0, 0, 0, 0],
+    [0, 131558114200/32700410799, -68118460800/10900136933, 87487479700/32700410799],
+    [0, -1754552775/470086768, 14199869525/1410260304, -10690763975/1880347072],
+    [0, 127303824393/49829197408, -318862633887/49829197408, 701980252875/199316789632],
+    [0, -282668133/205662961, 2019193451/616988883, -1453857185/822651844],
+    [0, 40617522/29380423, -110615467/29380423, 69997945/29380423],
+])
+
+def rk45(rhs, y0, t, args=(), rtol=1e-6, atol=1e-9, h0=None, stats=None):
+    """Adaptive Dormand-Prince 5(4) with dense output, returning the states at every time in t.
+
+    Step sizes follow the error estimate alone; the states at the times in t are
+    filled in from the method's continuous extension, so densely sampled output
+    costs no extra steps. The whole batch shares one step size, controlled by the
+    RMS error over all trajectories. If `stats` is a dict, the number of accepted
+    steps, rejected steps and right-hand-side evaluations are stored in it.
+    """
+    y = np.array(y0, dtype=float)
+    k = [np.empty_like(y) for _ in range(7)]
+    q = [np.empty_like(y) for _ in range(4)]
+    y_new, err, tmp, scratch = (np.empty_like(y) for _ in range(4))
+    sol = np.empty((len(t),) + y.shape)
+    sol[0] = y
+    counts = {"steps": 0, "rejections": 0, "evaluations": 1}
+
+    t_now = t[0]
+    i = 1  # Next output time
+    h = (t[-1] - t[0]) / 100 if h0 is None else h0
+    rhs(t_now, y, *args, out=k[0])
+    while t_now < t[-1]:
+        reaches_end = h >= t[-1] - t_now
+        h_try = t[-1] - t_now if reaches_end else h
+        for s in range(1, 7):
+            np.copyto(tmp, y)
+            for a, k_j in zip(DP_A[s], k):
+                if a:
+                    np.multiply(k_j, h_try * a, out=scratch)
+                    tmp += scratch
+            rhs(t_now + DP_C[s] * h_try, tmp, *args, out=k[s])
+        counts["evaluations"] += 6
+        # The last stage is evaluated at the 5th-order solution, so tmp is y_new
+        np.copyto(y_new, tmp)
+        err[...] = 0
+        for e, k_j in zip(DP_E, k):
+            if e:
+                np.multiply(k_j, h_try * e, out=scratch)
+                err += scratch
+
+        scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+        error = np.sqrt(np.mean((err / scale) ** 2))
+        factor = 0.9 * error ** -0.2 if error > 0 else 5.0
+        if error > 1:
+            counts["rejections"] += 1
+            h = h_try * max(0.2, factor)
+            continue
+
+        t_new = t[-1] if reaches_end else t_now + h_try
+        if i < len(t) and t[i] < t_new:
+            # Interpolation polynomial coefficients for this step
+            for m in range(4):
+                q[m][...] = 0
+                for p, k_j in zip(DP_P[:, m], k):
+                    if p:
+                        np.multiply(k_j, h_try * p, out=scratch)
+                        q[m] += scratch
+            while i < len(t) and t[i] < t_new:
+                theta = (t[i] - t_now) / h_try
+                out = sol[i]
+                np.multiply(q[3], theta, out=out)
+                for m in (2, 1, 0):
+                    out += q[m]
+                    out *= theta
+                out += y
+                i += 1
+        while i < len(t) and t[i] == t_new:
+            sol[i] = y_new
+            i += 1
+
+        t_now = t_new
+        y, y_new = y_new, y
+        k[0], k[6] = k[6], k[0]  # First same as last
+        counts["steps"] += 1
+        if h_try == h:
+            h *= min(5.0, factor)
+
+    if stats is not None:
+        stats.update(counts)
+    return sol
+
+def _kick_drift_kick(rhs, y0, t, args, every, weights):
+    """Composition of velocity-Verlet substeps of relative sizes `weights`"""
+    y = np.array(y0, dtype=float)
+    d = y.shape[-1] // 2
+    position, velocity = y[..., :d], y[..., d:]
+    dydt, scratch = np.empty_like(y), np.empty_like(y)
+    acceleration = dydt[..., d:]
+    sol = np.empty((len(t[::every]),) + y.shape)
+    sol[0] = y
+
+    rhs(t[0], y, *args, out=dydt)
+    for i in range(len(t) - 1):
+        h = t[i+1] - t[i]
+        t_sub = t[i]
+        for w in weights:
+            half_kick, drift = scratch[..., d:], scratch[..., :d]
+            np.multiply(acceleration, w * h / 2, out=half_kick)
+            velocity += half_kick
+            np.multiply(velocity, w * h, out=drift)
+            position += drift
+            t_sub += w * h
+            # Reuses this acceleration for the first half kick of the next substep
+            rhs(t_sub, y, *args, out=dydt)
+            np.multiply(acceleration, w * h / 2, out=half_kick)
+            velocity += half_kick
+        if (i + 1) % every == 0:
+            sol[(i + 1) // every] = y
+
+    return sol
+
+def velocity_verlet(rhs, y0, t, args=(), every=1):
+    """Second-order symplectic velocity Verlet (leapfrog) over the time grid t.
+
+    For systems q' = v, v' = a(t, q): the state holds the positions in its first half
+    and the velocities in its second half, and only the velocity half of rhs is used.
+    Energy errors stay bounded instead of drifting, however long the run.
+    """
+    return _kick_drift_kick(rhs, y0, t, args, every, (1.0,))
+
+# Yoshida's fourth-order composition of three Verlet substeps
+YOSHIDA_W1 = 1 / (2 - 2 ** (1/3))
+YOSHIDA_W0 = -(2 ** (1/3)) * YOSHIDA_W1
+
+def yoshida4(rhs, y0, t, args=(), every=1):
+    """Fourth-order symplectic Yoshida integrator, for the same systems as velocity_verlet"""
+    return _kick_drift_kick(rhs, y0, t, args, every, (YOSHIDA_W1, YOSHIDA_W0, YOSHIDA_W1))
+
+INTEGRATORS = {
+    "rk4": rk4,
+    "rk45": rk45,
+    "verlet": velocity_verlet,
+    "yoshida4": yoshida4,
+}
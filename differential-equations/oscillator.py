@@ -0,0 +1,194 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy.integrate import odeint
+from scipy.linalg import expm
+from scipy.signal import lfilter, ss2tf
+from forcing import SampledForcing, SinusoidForcing, as_forcing
+
+def simple_harmonic_oscillator(y, t, omega_n, zeta, f):
+    x, x_dot = y
+    x_dot_dot = -2 * zeta * omega_n * x_dot - omega_n ** 2 * x + f(t)
+    return [x_dot, x_dot_dot]
+
+def discretize_oscillator(omega_n, zeta, dt, hold="foh"):
+    """Exact discrete-time model of the oscillator for a forcing sampled every dt.
+
+    Returns (Phi, Gamma0, Gamma1) with y[k+1] = Phi y[k] + Gamma0 u[k] + Gamma1 u[k+1],
+    where y = (x, x_dot). "zoh" holds u constant between samples (Gamma1 = 0);
+    "foh" interpolates it linearly, which is exact for piecewise-linear forcing.
+    omega_n and zeta may be arrays, giving stacked matrices of shape (..., 2, 2).
+    """
+    omega_n, zeta = np.broadcast_arrays(np.asarray(omega_n, dtype=float), np.asarray(zeta, dtype=float))
+    # expm of the augmented matrix gives Phi and the two input integrals in one go
+    M = np.zeros(omega_n.shape + (4, 4))
+    M[..., 0, 1] = dt
+    M[..., 1, 0] = -omega_n ** 2 * dt
+    M[..., 1, 1] = -2 * zeta * omega_n * dt
+    M[..., 1, 2] = dt
+    M[..., 2, 3] = 1
+    E = expm(M)
+    Phi, first, second = E[..., :2, :2], E[..., :2, 2], E[..., :2, 3]
+    if hold == "zoh":
+        return Phi, first, np.zeros_like(second)
+    if hold == "foh":
+        return Phi, first - second, second
+    raise ValueError(f"Unknown hold {hold!r}, expected 'zoh' or 'foh'")
+
+def simulate_oscillator_sampled(omega_n, zeta, u, x0, x_dot0, dt, hold="foh"):
+    """Exact response to a forcing sampled every dt, computed as an IIR filter.
+
+    u has shape (n_samples,) or (n_records, n_samples) to filter many forcing records
+    in one call; x0 and x_dot0 broadcast against the records. Returns x and x_dot with
+    the shape of u.
+    """
+    u = np.asarray(u, dtype=float)
+    Phi, Gamma0, Gamma1 = discretize_oscillator(omega_n, zeta, dt, hold)
+
+    # With xi[k] = y[k] - Gamma1 u[k] the model is a standard state-space system
+    # xi[k+1] = Phi xi[k] + B u[k], y[k] = xi[k] + Gamma1 u[k]
+    B = (Phi @ Gamma1 + Gamma0).reshape(2, 1)
+    a = np.array([1, -np.trace(Phi), np.linalg.det(Phi)])
+
+    # The free response s[k] = c Phi^k xi[0] obeys the same recurrence as the
+    # denominator a, so it is a combination of the filter's impulse response h
+    impulse = np.zeros(u.shape[-1])
+    impulse[0] = 1
+    h = lfilter([1], a, impulse)
+    h_shifted = np.concatenate([[0], h[:-1]])
+    y0 = np.stack(np.broadcast_arrays(np.asarray(x0, dtype=float), np.asarray(x_dot0, dtype=float)), axis=-1)
+    xi0 = y0 - Gamma1 * u[..., :1]
+
+    outputs = []
+    for i, C in enumerate(np.eye(2)):
+        b, _ = ss2tf(Phi, B, C.reshape(1, 2), Gamma1[i:i+1].reshape(1, 1))
+        s0 = xi0 @ C
+        s1 = xi0 @ (C @ Phi)
+        free = s0[..., None] * h + (s1 + a[1] * s0)[..., None] * h_shifted
+        outputs.append(lfilter(b[0], a, u, axis=-1) + free)
+    return outputs[0], outputs[1]
+
+def _is_uniform(t):
+    dt = np.diff(t)
+    return len(t) > 1 and np.allclose(dt, dt[0], rtol=1e-9, atol=0)
+
+def _auto_method(f, t):
+    """"exact" for forcings known on t (samples, a sampled record or a sinusoid) when t is uniform.
+
+    A plain function of t would only be seen at the output times on the exact path,
+    losing whatever it does between them, so it keeps the odeint path.
+    """
+    known = isinstance(f, (np.ndarray, SampledForcing, SinusoidForcing))
+    return "exact" if known and _is_uniform(t) else "odeint"
+
+def simulate_oscillator(omega_n, zeta, f, x0, x_dot0, t, method="auto"):
+    """Simulate the forced oscillator and return x and x_dot at the times t.
+
+    f is anything as_forcing() accepts: a function of t, a (t, values) pair of
+    samples, a sinusoid spec dict or a Forcing. method="exact" samples f on t once
+    and uses the exact discrete-time model; it needs a uniform t. method="odeint"
+    integrates the right-hand side numerically, calling f once per evaluation.
+    "auto" uses the exact path for sampled and sinusoidal forcings on a uniform t,
+    and odeint for other functions of t or a non-uniform t.
+    """
+    f = as_forcing(f)
+    if method == "auto":
+        method = _auto_method(f, t)
+    if method == "exact":
+        if not _is_uniform(t):
+            raise ValueError("The exact method needs uniformly spaced times")
+        return simulate_oscillator_sampled(omega_n, zeta, f.sample(t), x0, x_dot0, t[1] - t[0])
+    if method != "odeint":
+        raise ValueError(f"Unknown method {method!r}, expected 'auto', 'exact' or 'odeint'")
+
+    y0 = [x0, x_dot0]
+    y = odeint(simple_harmonic_oscillator, y0, t, args=(omega_n, zeta, f))
+    return y[:, 0], y[:, 1]
+
+def _batch_exact(omega_n, zeta, u, x0, x_dot0, dt):
+    """First-order-hold recurrence advanced for every system at once"""
+    Phi, Gamma0, Gamma1 = discretize_oscillator(omega_n, zeta, dt)
+    n = u.shape[-1]
+    # Forcing contribution of every interval, computed up front for the whole batch
+    drive = Gamma0.T[:, None, :] * u.T[None, :-1] + Gamma1.T[:, None, :] * u.T[None, 1:]
+    x = np.empty((n, len(omega_n)))
+    x_dot = np.empty((n, len(omega_n)))
+    x[0] = x0
+    x_dot[0] = x_dot0
+    for k in range(n - 1):
+        x[k+1] = Phi[:, 0, 0] * x[k] + Phi[:, 0, 1] * x_dot[k] + drive[0, k]
+        x_dot[k+1] = Phi[:, 1, 0] * x[k] + Phi[:, 1, 1] * x_dot[k] + drive[1, k]
+    return x.T, x_dot.T
+
+def _batch_odeint(omega_n, zeta, f, x0, x_dot0, t):
+    """One odeint call on the stacked state (x of every system, then x_dot of every system)"""
+    B = len(omega_n)
+
+    def rhs(y, t):
+        x, x_dot = y[:B], y[B:]
+        return np.concatenate([x_dot, -2 * zeta * omega_n * x_dot - omega_n ** 2 * x + f(t)])
+
+    y = odeint(rhs, np.concatenate([x0, x_dot0]), t)
+    return y[:, :B].T, y[:, B:].T
+
+def _batch_chunk(args):
+    omega_n, zeta, f, u, x0, x_dot0, t, reduce = args
+    if u is None:
+        x, x_dot = _batch_odeint(omega_n, zeta, f, x0, x_dot0, t)
+    else:
+        x, x_dot = _batch_exact(omega_n, zeta, u, x0, x_dot0, t[1] - t[0])
+    return (x, x_dot) if reduce is None else reduce(x, x_dot)
+
+def simulate_oscillator_batch(omega_n, zeta, f, x0, x_dot0, t, method="auto", reduce=None,
+                              workers=None, chunk_size=4096):
+    """Simulate a grid of oscillators together and return stacked x and x_dot, shape (B, len(t)).
+
+    omega_n, zeta, x0 and x_dot0 broadcast to one value per system, flattened in C order
+    when they form a grid. f is anything as_forcing() accepts, shared by all systems,
+    or an array of samples on t with shape (len(t),) or (B, len(t)); B forcing records
+    with scalar parameters give B systems. method is
+    "exact" (first-order-hold recurrence on a uniform t), "odeint" (one odeint call
+    on the stacked state) or "auto", chosen as in simulate_oscillator().
+
+    The systems are processed in chunks of `chunk_size`, in a process pool when
+    workers > 1. For grids whose full time histories do not fit in memory, pass
+    reduce(x, x_dot), which maps a chunk to one result row per system (for example
+    the steady-state amplitude); its rows are returned instead of x and x_dot.
+    With workers > 1, reduce (and f, on the odeint path) must be picklable.
+    """
+    params = np.broadcast_arrays(omega_n, zeta, x0, x_dot0)
+    omega_n, zeta, x0, x_dot0 = (np.ravel(a).astype(float) for a in params)
+    samples = isinstance(f, np.ndarray)
+    if samples and f.ndim == 2:
+        # One forcing record per system: the records count towards the batch too
+        omega_n, zeta, x0, x_dot0 = np.broadcast_arrays(omega_n, zeta, x0, x_dot0, f[:, 0])[:4]
+    B = len(omega_n)
+    t = np.asarray(t, dtype=float)
+    if method == "auto":
+        method = _auto_method(f if samples else as_forcing(f), t)
+    if method == "exact":
+        if not _is_uniform(t):
+            raise ValueError("The exact method needs uniformly spaced times")
+        # Only the samples are sent to the chunks, so f itself need not be picklable
+        u = np.broadcast_to(f if samples else as_forcing(f).sample(t), (B, len(t)))
+        f = None
+    elif method == "odeint":
+        if samples:
+            raise ValueError("The odeint method needs f as a function of t")
+        f = as_forcing(f)
+        u = None
+    else:
+        raise ValueError(f"Unknown method {method!r}, expected 'auto', 'exact' or 'odeint'")
+
+    chunks = [(omega_n[i:i + chunk_size], zeta[i:i + chunk_size], f,
+               None if u is None else u[i:i + chunk_size],
+               x0[i:i + chunk_size], x_dot0[i:i + chunk_size], t, reduce)
+              for i in range(0, B, chunk_size)]
+    if workers and workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_batch_chunk, chunks))
+    else:
+        results = [_batch_chunk(chunk) for chunk in chunks]
+
+    if reduce is not None:
+        return np.concatenate(results)
+    return np.concatenate([x for x, _ in results]), np.concatenate([x_dot for _, x_dot in results])
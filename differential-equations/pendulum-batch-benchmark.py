@@ -0,0 +1,44 @@
+import time
+import numpy as np
+from integrators import rk4
+from pendulum import pendulum_ode
+
+# A phase-portrait sweep: many pendulums with different initial states and
+# lengths, advanced one at a time with the original list-based RK4 loop versus
+# all at once with the batched in-place integrator.
+g = 9.81
+t = np.linspace(0, 10, 1000)
+n_loop = 100
+n_batch = 10**5
+
+rng = np.random.default_rng(0)
+y0 = np.column_stack([rng.uniform(-np.pi, np.pi, n_batch), rng.uniform(-6, 6, n_batch)])
+l = rng.uniform(0.5, 2.0, n_batch)
+
+def pendulum_ode_list(t, y, g, l):
+    theta, omega = y
+    return [omega, -(g / l) * np.sin(theta)]
+
+def rk4_loop(y0, g, l):
+    sol = np.zeros((len(t), 2))
+    sol[0] = y0
+    for i in range(len(t) - 1):
+        h = t[i+1] - t[i]
+        k1 = h * np.array(pendulum_ode_list(t[i], sol[i], g, l))
+        k2 = h * np.array(pendulum_ode_list(t[i] + h/2, sol[i] + k1/2, g, l))
+        k3 = h * np.array(pendulum_ode_list(t[i] + h/2, sol[i] + k2/2, g, l))
+        k4 = h * np.array(pendulum_ode_list(t[i] + h, sol[i] + k3, g, l))
+        sol[i+1] = sol[i] + (k1 + 2*k2 + 2*k3 + k4) / 6
+    return sol
+
+start = time.perf_counter()
+loop_final = np.array([rk4_loop(y0[i], g, l[i])[-1] for i in range(n_loop)])
+loop_time = time.perf_counter() - start
+
+start = time.perf_counter()
+batch = rk4(pendulum_ode, y0, t, args=(g, l), every=len(t) - 1)
+batch_time = time.perf_counter() - start
+
+print(f"Python loop: {n_loop / loop_time:12.0f} trajectories/s")
+print(f"Batched:     {n_batch / batch_time:12.0f} trajectories/s ({n_batch} in {batch_time:.2f} s)")
+print(f"Max difference: {np.max(np.abs(batch[-1, :n_loop] - loop_final)):.2e}")
@@ -0,0 +1,42 @@
+import time
+import numpy as np
+from integrators import INTEGRATORS
+from pendulum import pendulum_energy, pendulum_ode
+
+# Long-horizon pendulum runs: steps, wall time and worst relative energy error for
+# each integrator, to pick the cheapest one that meets an energy tolerance.
+# For rk45 the step count includes rejected steps.
+g = 9.81
+l = 1.0
+y0 = [np.pi / 4, 0]
+T = 200.0
+t_out = np.linspace(0, T, 20001)  # Energy is checked on this grid
+step_sizes = [0.1, 0.05, 0.02, 0.01]
+tolerances = [1e-4, 1e-6, 1e-8, 1e-10]
+energy_tolerance = 1e-6
+
+E0 = pendulum_energy(np.array(y0), g, l)
+results = []
+for name, integrate in INTEGRATORS.items():
+    for setting in (tolerances if name == "rk45" else step_sizes):
+        stats = {}
+        start = time.perf_counter()
+        if name == "rk45":
+            sol = integrate(pendulum_ode, y0, t_out, args=(g, l), rtol=setting, atol=setting * 1e-3, stats=stats)
+            steps = stats["steps"] + stats["rejections"]
+        else:
+            t = np.linspace(0, T, round(T / setting) + 1)
+            sol = integrate(pendulum_ode, y0, t, args=(g, l))
+            steps = len(t) - 1
+        wall = time.perf_counter() - start
+        error = np.max(np.abs(pendulum_energy(sol, g, l) - E0)) / E0
+        results.append((name, setting, steps, wall, error))
+
+print(f"{'method':>9} {'h / rtol':>9} {'steps':>8} {'time [s]':>9} {'energy err':>11}")
+for name, setting, steps, wall, error in results:
+    print(f"{name:>9} {setting:>9.0e} {steps:>8} {wall:>9.3f} {error:>11.2e}")
+
+good = [r for r in results if r[4] <= energy_tolerance]
+if good:
+    name, setting, steps, wall, error = min(good, key=lambda r: r[3])
+    print(f"\nCheapest run with energy error <= {energy_tolerance:.0e}: {name} ({setting:.0e}), {wall:.3f} s")
@@ -0,0 +1,21 @@
+import numpy as np
+
+# Define the ODEs
+def pendulum_ode(t, y, g, l, out=None):
+    """Right-hand side of the pendulum for a state (theta, omega) or a batch of them.
+
+    y has shape (2,) or (n_trajectories, 2); g and l may be scalars or one value per
+    trajectory. The derivative is written into `out` when it is given.
+    """
+    y = np.asarray(y)
+    if out is None:
+        out = np.empty(y.shape)
+    out[..., 0] = y[..., 1]
+    np.sin(y[..., 0], out=out[..., 1])
+    out[..., 1] *= -np.divide(g, l)
+    return out
+
+def pendulum_energy(y, g, l):
+    """Total mechanical energy per unit mass of a state (theta, omega) or a batch of them"""
+    theta, omega = y[..., 0], y[..., 1]
+    return 0.5 * (l * omega) ** 2 + g * l * (1 - np.cos(theta))
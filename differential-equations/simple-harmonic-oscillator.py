@@ -1,16 +1,6 @@
 import numpy as np
-from scipy.integrate import odeint
 import matplotlib.pyplot as plt
-
-def simple_harmonic_oscillator(y, t, omega_n, zeta, f):
-    x, x_dot = y
-    x_dot_dot = -2 * zeta * omega_n * x_dot - omega_n ** 2 * x + f(t)
-    return [x_dot, x_dot_dot]
-
-def simulate_oscillator(omega_n, zeta, f, x0, x_dot0, t):
-    y0 = [x0, x_dot0]
-    y = odeint(simple_harmonic_oscillator, y0, t, args=(omega_n, zeta, f))
-    return y[:, 0], y[:, 1]
+from oscillator import simulate_oscillator
 
 def sin_force(t):
     return np.sin(2 * np.pi * t)
@@ -26,4 +16,4 @@ x, x_dot = simulate_oscillator(omega_n, zeta, sin_force, x0, x_dot0, t)
 plt.plot(t, x)
 plt.xlabel('Time (s)')
 plt.ylabel('Displacement (m)')
-plt.show()
\ No newline at end of file
+plt.show()
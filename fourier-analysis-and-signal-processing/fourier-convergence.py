@@ -0,0 +1,23 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from fourier_series import square_wave_partial_sums
+
+# Convergence of the square-wave Fourier series: errors of every partial sum
+# n = 1..n_max, streamed one harmonic at a time
+t = np.linspace(0, 2, 100000)
+n_max = 2000
+
+n_values, l2_errors, max_errors = [], [], []
+for n, approx, (l2, linf) in square_wave_partial_sums(t, n_max):
+    n_values.append(n)
+    l2_errors.append(l2)
+    max_errors.append(linf)
+
+plt.loglog(n_values, l2_errors, label="L2 (RMS) error")
+plt.loglog(n_values, max_errors, label="Max error (stays near 1 at the jumps)")
+plt.title("Square Wave Fourier Series Convergence")
+plt.xlabel("Highest harmonic n")
+plt.ylabel("Error")
+plt.legend()
+plt.grid()
+plt.show()
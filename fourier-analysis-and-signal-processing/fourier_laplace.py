@@ -0,0 +1,82 @@
+import numpy as np
+from fourier_series import square_wave_fourier_series
+from spectrum import amplitude_spectrum, plot_spectrum
+from transfer_function import first_order_lag
+
+# Fourier series, Fourier transform and Laplace transform examples.
+# Importing this module only loads numpy: matplotlib, scipy.signal and
+# scipy.integrate are imported by the functions that use them, so batch jobs can
+# reuse square_wave_fourier_series or the spectra without a display backend.
+# Run it as a script (python fourier_laplace.py) for the plotted demo.
+
+def square_wave(t):
+    """+/-1 square wave of period 1"""
+    from scipy.signal import square
+    return square(2 * np.pi * np.asarray(t, dtype=float))
+
+# Fourier Transform
+def plot_fft(t, signal, title, ax=None):
+    freqs, X = amplitude_spectrum(signal, t[1] - t[0], band=(0, 15))
+    return plot_spectrum(freqs, X, title, ax=ax, xlim=(0, 15))
+
+# Laplace Transform - first-order system example
+# K is a constant input or a function of t (e.g. a Forcing from differential-equations/forcing.py)
+def first_order_system(y, t, K, tau):
+    u = K(t) if callable(K) else K
+    dydt = (-y + u) / tau
+    return dydt
+
+def first_order_response(t, K=1, tau=0.5, method="exact"):
+    """Response from rest of 1 / (tau s + 1) driven by K.
+
+    "exact" uses the closed-form step response for a constant K and the exact
+    sampled response otherwise (uniform t); "odeint" integrates first_order_system.
+    """
+    t = np.asarray(t, dtype=float)
+    if method == "odeint":
+        from scipy.integrate import odeint
+        return odeint(first_order_system, 0, t, args=(K, tau))[:, 0]
+    if method != "exact":
+        raise ValueError(f"Unknown method {method!r}, expected 'exact' or 'odeint'")
+    system = first_order_lag(tau)
+    return system.response(K(t), t) if callable(K) else K * system.step(t)
+
+def main():
+    import matplotlib.pyplot as plt
+
+    # Time domain
+    t = np.linspace(0, 2, 1000)
+    wave = square_wave(t)
+
+    # Fourier series example
+    n_terms = 10
+    square_wave_approx = square_wave_fourier_series(t, n_terms)
+
+    # Laplace transform example - first-order system response
+    response = first_order_response(t, K=1, tau=0.5)
+
+    # Plot results
+    fig, axs = plt.subplots(3, 1, figsize=(8, 12))
+    axs[0].plot(t, wave, label="Square Wave")
+    axs[0].plot(t, square_wave_approx, label=f"Fourier Series ({n_terms} terms)")
+    axs[0].set_title("Fourier Series")
+    axs[0].set_xlabel("Time [s]")
+    axs[0].set_ylabel("Amplitude")
+    axs[0].legend()
+    axs[0].grid()
+
+    # Fourier transform example
+    plot_fft(t, wave, "Fourier Transform of a Square Wave", ax=axs[1])
+
+    axs[2].plot(t, response, label="First-order System Response")
+    axs[2].set_title("Laplace Transform (First-order System Example)")
+    axs[2].set_xlabel("Time [s]")
+    axs[2].set_ylabel("Amplitude")
+    axs[2].legend()
+    axs[2].grid()
+
+    plt.tight_layout()
+    plt.show()
+
+if __name__ == "__main__":
+    main()
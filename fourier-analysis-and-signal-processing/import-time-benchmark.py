@@ -0,0 +1,34 @@
+import subprocess
+import sys
+
+# Headless start-up cost of the Fourier/Laplace library. Each module is imported
+# in a fresh interpreter (best of several runs), and the heavy dependencies that
+# must stay unloaded are checked, so a top-level import that sneaks back in shows
+# up as a failure rather than as a slower batch service.
+MODULES = ["fourier_laplace", "fourier_series", "spectrum", "transfer_function"]
+LAZY = ["matplotlib", "scipy.signal", "scipy.integrate", "scipy.fft", "scipy.linalg"]
+repeats = 5
+
+probe = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed, *[name for name in {lazy!r} if name in sys.modules])
+"""
+
+baseline = min(float(subprocess.run([sys.executable, "-c", "import time; s = time.perf_counter(); import numpy; print(time.perf_counter() - s)"],
+                                    capture_output=True, text=True, check=True).stdout)
+               for _ in range(repeats))
+print(f"{'numpy':20s} {baseline * 1e3:8.1f} ms")
+
+failed = False
+for module in MODULES:
+    runs = [subprocess.run([sys.executable, "-c", probe.format(module=module, lazy=LAZY)],
+                           capture_output=True, text=True, check=True).stdout.split() for _ in range(repeats)]
+    elapsed = min(float(run[0]) for run in runs)
+    loaded = runs[0][1:]
+    print(f"{module:20s} {elapsed * 1e3:8.1f} ms" + (f"  loads {', '.join(loaded)}" if loaded else ""))
+    failed |= bool(loaded)
+
+sys.exit(1 if failed else 0)
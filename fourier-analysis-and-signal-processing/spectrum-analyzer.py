@@ -0,0 +1,29 @@
+import sys
+import numpy as np
+from spectrum import plot_spectrum, welch_psd
+
+# Welch power spectrum of a long recording stored as a .npy file, read in blocks
+# through a memory map so the whole recording never has to fit in memory.
+# Usage: python spectrum-analyzer.py recording.npy sample_interval_s [--headless]
+# Without arguments a synthetic 10-minute, 1 kHz sensor recording is generated.
+if len(sys.argv) >= 3:
+    path, dt = sys.argv[1], float(sys.argv[2])
+else:
+    path, dt = "sensor-recording.npy", 1e-3
+    n = 600_000
+    recording = np.lib.format.open_memmap(path, mode="w+", dtype=float, shape=(n,))
+    rng = np.random.default_rng(0)
+    for i in range(0, n, 100_000):
+        t = np.arange(i, min(i + 100_000, n)) * dt
+        recording[i:i + len(t)] = np.sin(2 * np.pi * 50 * t) + 0.5 * np.sin(2 * np.pi * 120 * t) \
+            + rng.standard_normal(len(t))
+    recording.flush()
+
+freqs, psd = welch_psd(np.load(path, mmap_mode="r"), dt, segment_length=4096)
+print(f"Peak at {freqs[np.argmax(psd)]:.2f} Hz")
+
+if "--headless" not in sys.argv:
+    import matplotlib.pyplot as plt
+    plot_spectrum(freqs, psd, "Welch Power Spectrum", ylabel="PSD [units^2/Hz]")
+    plt.yscale("log")
+    plt.show()
@@ -0,0 +1,218 @@
+import functools
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Spectral analysis engine. Nothing here imports matplotlib, so it runs headless
+# in batch jobs; plot_spectrum() is the thin plotting layer on top. scipy is only
+# imported by the functions that use it, which keeps importing this module cheap.
+#
+# Windows and frequency vectors are cached per (window, n) and (n, dt), so
+# repeated analyses of equal-length frames do not rebuild them. Cached arrays
+# are read-only. SpectrumPlan goes one step further for fixed-length frames: it
+# fixes the band, the method and the window once, and spectrum_plan() caches the
+# plans themselves.
+
+# "auto" projects directly onto the band's frequencies when there are at most this
+# many of them and their basis fits in DFT_MAX_BYTES; otherwise it slices an rfft
+DFT_MAX_BINS = 16
+DFT_MAX_BYTES = 16 * 2**20
+
+@functools.lru_cache(maxsize=64)
+def cached_window(window, n):
+    from scipy.signal import get_window
+    w = get_window(window, n)
+    w.flags.writeable = False
+    return w
+
+@functools.lru_cache(maxsize=64)
+def rfft_frequencies(n, dt):
+    f = np.fft.rfftfreq(n, dt)
+    f.flags.writeable = False
+    return f
+
+class SpectrumPlan:
+    """Spectrum of real frames of n samples spaced dt apart, restricted to a frequency band.
+
+    band is (f_min, f_max) in Hz, or None for 0 up to Nyquist. method is
+    "rfft": the rfft bins inside the band, sliced out of a full rfft;
+    "zoom": m equally spaced frequencies from f_min to f_max by a chirp-z zoom FFT,
+            for resolving a band more finely than the rfft bins (1 / (n dt));
+    "dft":  direct projection onto the band's frequencies, O(n m) with a cached
+            basis, which beats a full transform when the band holds only a few bins;
+    "auto": "dft" for a few frequencies, else "rfft" for the rfft bins, else "zoom".
+    m defaults to the number of rfft bins in the band, in which case every method
+    returns the same frequencies. Frames may be batched along leading axes; workers
+    is passed to scipy.fft for multi-threaded transforms of a batch.
+    """
+
+    def __init__(self, n, dt, band=None, m=None, method="auto", window=None, workers=None):
+        self.n, self.dt, self.workers = n, dt, workers
+        df = 1 / (n * dt)
+        f_min, f_max = (0.0, n // 2 * df) if band is None else band
+        f_max = min(f_max, n // 2 * df)
+        k_min = max(int(np.ceil(f_min / df - 1e-9)), 0)
+        k_max = min(int(np.floor(f_max / df + 1e-9)), n // 2)
+        if m is None:
+            if k_max < k_min:
+                raise ValueError(f"No frequency bins between {f_min} and {f_max} Hz")
+            m = k_max - k_min + 1
+            frequencies = rfft_frequencies(n, dt)[k_min:k_max + 1]
+        else:
+            frequencies = np.linspace(f_min, f_max, m)
+        aligned = len(frequencies) == k_max - k_min + 1 and np.allclose(frequencies, np.arange(k_min, k_max + 1) * df)
+        if method == "auto":
+            if m <= DFT_MAX_BINS and n * m * 16 <= DFT_MAX_BYTES:
+                method = "dft"
+            else:
+                method = "rfft" if aligned else "zoom"
+        if method == "rfft" and not aligned:
+            raise ValueError("The rfft method only returns the rfft bins; use 'zoom' or 'dft' for other frequencies")
+
+        self.method = method
+        self.frequencies = frequencies
+        self.window = None if window is None else cached_window(window, n)
+        if method == "rfft":
+            self._bins = slice(k_min, k_max + 1)
+        elif method == "zoom":
+            from scipy.signal import ZoomFFT
+            self._zoom = ZoomFFT(n, [frequencies[0], frequencies[-1]], m, fs=1 / dt, endpoint=True)
+        elif method == "dft":
+            angles = np.multiply.outer(np.arange(n) * dt, 2 * np.pi * frequencies)
+            self._cos, self._sin = np.cos(angles), np.sin(angles)
+        else:
+            raise ValueError(f"Unknown method {method!r}, expected 'auto', 'rfft', 'zoom' or 'dft'")
+        self._work = np.empty(n) if window is not None else None
+
+    def _windowed(self, frames):
+        frames = np.asarray(frames, dtype=float)
+        if self.window is None:
+            return frames
+        # A single frame is windowed into the plan's workspace instead of a new array
+        if frames.shape == self._work.shape:
+            return np.multiply(frames, self.window, out=self._work)
+        return frames * self.window
+
+    def __call__(self, frames):
+        """Complex spectrum at self.frequencies, along the last axis of frames"""
+        from scipy import fft as sp_fft
+        frames = self._windowed(frames)
+        if self.method == "rfft":
+            return sp_fft.rfft(frames, axis=-1, workers=self.workers)[..., self._bins]
+        if self.method == "zoom":
+            if self.workers is None:
+                return self._zoom(frames, axis=-1)
+            with sp_fft.set_workers(self.workers):
+                return self._zoom(frames, axis=-1)
+        return frames @ self._cos - 1j * (frames @ self._sin)
+
+    def amplitude(self, frames):
+        """|spectrum| at self.frequencies"""
+        return np.abs(self(frames))
+
+@functools.lru_cache(maxsize=64)
+def spectrum_plan(n, dt, band=None, m=None, method="auto", window=None, workers=None):
+    """Cached SpectrumPlan; band must be a tuple so it can be hashed"""
+    return SpectrumPlan(n, dt, band, m, method, window, workers)
+
+def amplitude_spectrum(signal, dt, band=None, method="auto", workers=None):
+    """Frequencies and |FFT| of a real signal (or a batch of them along the last axis).
+
+    Only non-negative frequencies are returned, limited to band=(f_min, f_max) if
+    given. The plan for the signal length is cached across calls.
+    """
+    signal = np.asarray(signal, dtype=float)
+    plan = spectrum_plan(signal.shape[-1], dt, None if band is None else tuple(band), None, method, None, workers)
+    return plan.frequencies, plan.amplitude(signal)
+
+def _blocks(source, block_size):
+    """Fixed-size blocks from an array (including a memory map) or an iterator of blocks"""
+    if hasattr(source, "__getitem__") and hasattr(source, "shape"):
+        for i in range(0, len(source), block_size):
+            yield np.asarray(source[i:i + block_size], dtype=float)
+    else:
+        for block in source:
+            yield np.asarray(block, dtype=float)
+
+class WelchAccumulator:
+    """Running Welch average of the one-sided power spectral density.
+
+    Feed the signal in blocks of any size with update(); samples that do not yet
+    fill a segment are carried over to the next block, so the result is the same
+    as analysing the whole signal at once. Each segment has its mean removed and
+    is windowed before its rfft, as in scipy.signal.welch.
+    """
+
+    def __init__(self, dt, segment_length=4096, window="hann", overlap=0.5):
+        self.dt = dt
+        self.segment_length = segment_length
+        self.step = segment_length - int(overlap * segment_length)
+        self.window = cached_window(window, segment_length)
+        self.frequencies = rfft_frequencies(segment_length, dt)
+        self.power_sum = np.zeros(len(self.frequencies))
+        self.n_segments = 0
+        self._carry = np.zeros(0)
+
+    def segments(self, block):
+        """Windowed, mean-removed segments completed by this block, one per row"""
+        buffer = np.concatenate([self._carry, block])
+        if len(buffer) < self.segment_length:
+            self._carry = buffer
+            return np.zeros((0, self.segment_length))
+        segments = sliding_window_view(buffer, self.segment_length)[::self.step]
+        self._carry = buffer[len(segments) * self.step:]
+        return (segments - segments.mean(axis=1, keepdims=True)) * self.window
+
+    def update(self, block):
+        from scipy import fft as sp_fft
+        spectra = sp_fft.rfft(self.segments(block), axis=1)
+        self.power_sum += np.sum(spectra.real ** 2 + spectra.imag ** 2, axis=0)
+        self.n_segments += len(spectra)
+        return self
+
+    @property
+    def psd(self):
+        """Averaged power spectral density (units^2/Hz) of the segments seen so far"""
+        scale = self.dt / np.sum(self.window ** 2)
+        psd = self.power_sum * scale / max(self.n_segments, 1)
+        # One-sided: fold the negative frequencies in, except at DC and Nyquist
+        psd[1:len(psd) - (self.segment_length % 2 == 0)] *= 2
+        return psd
+
+def welch_psd(source, dt, segment_length=4096, window="hann", overlap=0.5, block_size=2**20):
+    """Welch PSD of a signal read in blocks of `block_size` samples.
+
+    source is an array, a memory-mapped array (e.g. np.load(path, mmap_mode="r"))
+    or an iterator of blocks, so recordings larger than memory are streamed.
+    Returns the frequencies and the PSD.
+    """
+    welch = WelchAccumulator(dt, segment_length, window, overlap)
+    for block in _blocks(source, block_size):
+        welch.update(block)
+    return welch.frequencies, welch.psd
+
+def stft(source, dt, segment_length=4096, window="hann", overlap=0.5, block_size=2**20):
+    """Yield (times, spectra) per block read: the complex rfft of each segment, one per row.
+
+    times are the segment centres. Only one block of spectra is held at a time.
+    """
+    from scipy import fft as sp_fft
+    welch = WelchAccumulator(dt, segment_length, window, overlap)
+    first = 0
+    for block in _blocks(source, block_size):
+        segments = welch.segments(block)
+        if len(segments):
+            starts = first + welch.step * np.arange(len(segments))
+            first = starts[-1] + welch.step
+            yield (starts + segment_length / 2) * dt, sp_fft.rfft(segments, axis=1)
+
+def plot_spectrum(frequencies, values, title, ax=None, xlim=None, ylabel="Magnitude"):
+    import matplotlib.pyplot as plt
+    ax = plt.gca() if ax is None else ax
+    ax.plot(frequencies, values)
+    ax.set_title(title)
+    ax.set_xlabel("Frequency [Hz]")
+    ax.set_ylabel(ylabel)
+    if xlim is not None:
+        ax.set_xlim(*xlim)
+    ax.grid()
+    return ax
@@ -0,0 +1,35 @@
+import time
+import numpy as np
+from scipy.integrate import odeint
+from transfer_function import TransferFunction, first_order_lag, second_order
+
+# Design sweep: step responses of a lag in series with a second-order plant under
+# unit feedback, for a grid of lag time constants. odeint on the closed-loop ODE
+# against the closed-form partial-fraction response, then a dense Bode sweep.
+t = np.linspace(0, 10, 2000)
+taus = np.linspace(0.05, 1.0, 200)
+plant = second_order(4, 0.3)
+
+def closed_loop_rhs(y, t, A, B):
+    return A @ y + B[:, 0]
+
+start = time.perf_counter()
+ode_steps = []
+for tau in taus:
+    A, B, C, D = (first_order_lag(tau) * plant).feedback().state_space()
+    ode_steps.append((odeint(closed_loop_rhs, np.zeros(len(A)), t, args=(A, B)) @ C[0]) + D[0, 0])
+ode_time = time.perf_counter() - start
+
+start = time.perf_counter()
+steps = [(first_order_lag(tau) * plant).feedback().step(t) for tau in taus]
+analytic_time = time.perf_counter() - start
+
+print(f"odeint:            {len(taus) / ode_time:8.1f} designs/s")
+print(f"Partial fractions: {len(taus) / analytic_time:8.1f} designs/s ({ode_time / analytic_time:.0f}x)")
+print(f"Max difference: {np.max(np.abs(np.array(steps) - ode_steps)):.2e}")
+
+omega = np.logspace(-2, 3, 100_000)
+system = TransferFunction([1, 2], [1, 3, 5, 2]).feedback(2)
+start = time.perf_counter()
+magnitude, phase = system.bode(omega)
+print(f"Bode over {len(omega)} frequencies: {(time.perf_counter() - start) * 1e3:.1f} ms")
@@ -0,0 +1,225 @@
+import numpy as np
+
+# Linear time-invariant systems as Laplace-domain transfer functions
+# H(s) = num(s) / den(s), coefficients in descending powers of s as in numpy.polyval.
+#
+# Responses are computed without an ODE solver, for all times at once:
+# - step and impulse responses from the partial-fraction expansion
+#   H(s) = D + sum_i r_i / (s - p_i), i.e. sums of exponentials exp(p_i t);
+#   with repeated (or nearly repeated) poles, where the residues are ill-conditioned,
+#   from the matrix exponential of the state-space model at every t instead;
+# - the response to an arbitrary sampled input from the exact first-order-hold
+#   discretization, applied as an IIR filter (exact for piecewise-linear inputs).
+# Every response starts from rest (zero initial state). scipy is imported by the
+# methods that need it, so building and composing systems stays import-free.
+
+# Poles closer than this (relative to their magnitude) count as repeated
+REPEATED_POLE_TOL = 1e-6
+
+class TransferFunction:
+    """Proper transfer function num(s) / den(s) of a single-input single-output system.
+
+    TransferFunctions compose with * (series), + (parallel) and feedback(); plain
+    numbers act as static gains.
+    """
+
+    def __init__(self, num, den):
+        num = np.trim_zeros(np.atleast_1d(np.asarray(num, dtype=float)), "f")
+        den = np.trim_zeros(np.atleast_1d(np.asarray(den, dtype=float)), "f")
+        if len(den) == 0:
+            raise ValueError("The denominator must not be zero")
+        if len(num) > len(den):
+            raise ValueError("The transfer function must be proper (deg num <= deg den)")
+        # Monic denominator, numerator padded to the same length
+        self.num = np.concatenate([np.zeros(len(den) - max(len(num), 1)), num if len(num) else [0.0]]) / den[0]
+        self.den = den / den[0]
+
+    def __repr__(self):
+        return f"TransferFunction({self.num.tolist()}, {self.den.tolist()})"
+
+    @property
+    def order(self):
+        return len(self.den) - 1
+
+    @property
+    def poles(self):
+        return np.roots(self.den)
+
+    @property
+    def zeros(self):
+        return np.roots(np.trim_zeros(self.num, "f"))
+
+    @property
+    def dc_gain(self):
+        return self.num[-1] / self.den[-1]
+
+    def __call__(self, s):
+        """H(s) at an array of complex s"""
+        s = np.asarray(s, dtype=complex)
+        return np.polyval(self.num, s) / np.polyval(self.den, s)
+
+    # Composition
+
+    def __mul__(self, other):
+        other = _as_tf(other)
+        return TransferFunction(np.convolve(self.num, other.num), np.convolve(self.den, other.den))
+
+    __rmul__ = __mul__
+
+    def __add__(self, other):
+        other = _as_tf(other)
+        return TransferFunction(np.polyadd(np.convolve(self.num, other.den), np.convolve(other.num, self.den)),
+                                np.convolve(self.den, other.den))
+
+    __radd__ = __add__
+
+    def __neg__(self):
+        return TransferFunction(-self.num, self.den)
+
+    def __sub__(self, other):
+        return self + -_as_tf(other)
+
+    def feedback(self, other=1.0, sign=-1):
+        """Closed loop of self in the forward path and other in the feedback path (negative by default)"""
+        other = _as_tf(other)
+        return TransferFunction(np.convolve(self.num, other.den),
+                                np.polysub(np.convolve(self.den, other.den), sign * np.convolve(self.num, other.num)))
+
+    # Frequency domain
+
+    def frequency_response(self, omega):
+        """H(j omega) for an array of angular frequencies (rad/s)"""
+        return self(1j * np.asarray(omega, dtype=float))
+
+    def bode(self, omega):
+        """Magnitude (dB) and unwrapped phase (degrees) at the angular frequencies omega"""
+        H = self.frequency_response(omega)
+        return 20 * np.log10(np.abs(H)), np.degrees(np.unwrap(np.angle(H)))
+
+    def nyquist(self, omega):
+        """Real and imaginary parts of H(j omega)"""
+        H = self.frequency_response(omega)
+        return H.real, H.imag
+
+    # Time domain
+
+    def state_space(self):
+        """Controllable canonical (A, B, C, D), as scipy.signal.tf2ss returns it"""
+        n = self.order
+        A = np.eye(n, k=-1)
+        A[0] = -self.den[1:]
+        B = np.eye(n, 1)
+        C = (self.num[1:] - self.num[0] * self.den[1:]).reshape(1, n)
+        D = np.array([[self.num[0]]])
+        return A, B, C, D
+
+    def residues(self):
+        """Poles p, residues r and direct term D of H(s) = D + sum r / (s - p), for distinct poles"""
+        D = self.num[0]
+        strictly_proper = self.num - D * self.den
+        p = self.poles
+        r = np.polyval(strictly_proper, p) / np.polyval(np.polyder(self.den), p)
+        return p, r, D
+
+    def _has_repeated_poles(self):
+        p = self.poles
+        gaps = np.abs(p[:, None] - p[None, :])
+        np.fill_diagonal(gaps, np.inf)
+        return bool(np.any(gaps < REPEATED_POLE_TOL * np.maximum(1, np.abs(p))[:, None]))
+
+    def _method(self, method):
+        if method == "auto":
+            return "expm" if self._has_repeated_poles() else "residues"
+        if method not in ("residues", "expm"):
+            raise ValueError(f"Unknown method {method!r}, expected 'auto', 'residues' or 'expm'")
+        return method
+
+    def impulse(self, t, method="auto"):
+        """Impulse response at the times t >= 0, excluding the D * delta(t) term of a biproper H"""
+        t = np.asarray(t, dtype=float)
+        if self.order == 0:
+            return np.zeros(t.shape)
+        if self._method(method) == "residues":
+            p, r, _ = self.residues()
+            return (np.exp(np.multiply.outer(t, p)) @ r).real
+        from scipy.linalg import expm
+        A, B, C, _ = self.state_space()
+        return (C @ expm(np.multiply.outer(t, A)) @ B)[..., 0, 0]
+
+    def step(self, t, method="auto"):
+        """Unit step response at the times t >= 0"""
+        t = np.asarray(t, dtype=float)
+        if self.order == 0:
+            return np.full(t.shape, self.num[0])
+        if self._method(method) == "residues":
+            p, r, D = self.residues()
+            pt = np.multiply.outer(t, p)
+            # (exp(p t) - 1) / p, which tends to t for a pole at the origin
+            with np.errstate(divide="ignore", invalid="ignore"):
+                integrals = np.where(p == 0, t[..., None], np.expm1(pt) / p)
+            return D + (integrals @ r).real
+        from scipy.linalg import expm
+        # exp([[A, B], [0, 0]] t) holds the integral of exp(A s) B from 0 to t in its last column
+        A, B, C, D = self.state_space()
+        n = self.order
+        M = np.zeros((n + 1, n + 1))
+        M[:n, :n] = A
+        M[:n, n:] = B
+        E = expm(np.multiply.outer(t, M))
+        return (C @ E[..., :n, n:])[..., 0, 0] + D[0, 0]
+
+    def discretize(self, dt):
+        """Exact first-order-hold model: x[k+1] = Phi x[k] + Gamma0 u[k] + Gamma1 u[k+1]"""
+        from scipy.linalg import expm
+        A, B, _, _ = self.state_space()
+        n = self.order
+        M = np.zeros((n + 2, n + 2))
+        M[:n, :n] = A * dt
+        M[:n, n] = B[:, 0] * dt
+        M[n, n + 1] = 1
+        E = expm(M)
+        Phi, first, second = E[:n, :n], E[:n, n], E[:n, n + 1]
+        return Phi, first - second, second
+
+    def response(self, u, t):
+        """Response from rest to the input sampled as u on the uniform grid t.
+
+        u has shape (len(t),) or (n_records, len(t)) to filter many inputs in one call.
+        """
+        from scipy.signal import lfilter, ss2tf
+        u = np.asarray(u, dtype=float)
+        t = np.asarray(t, dtype=float)
+        dt = np.diff(t)
+        if len(t) < 2 or not np.allclose(dt, dt[0], rtol=1e-9, atol=0):
+            raise ValueError("response() needs uniformly spaced times")
+        if self.order == 0:
+            return self.num[0] * u
+        _, _, C, D = self.state_space()
+        Phi, Gamma0, Gamma1 = self.discretize(dt[0])
+
+        # With xi[k] = x[k] - Gamma1 u[k]: xi[k+1] = Phi xi[k] + B u[k], y[k] = C xi[k] + D' u[k]
+        B = (Phi @ Gamma1 + Gamma0).reshape(-1, 1)
+        b, a = ss2tf(Phi, B, C, D + C @ Gamma1.reshape(-1, 1))
+        forced = lfilter(b[0], a, u, axis=-1)
+
+        # x[0] = 0 leaves xi[0] = -Gamma1 u[0]; its free response C Phi^k xi[0] is the
+        # impulse response of (Phi, Phi xi[0], C, C xi[0]), scaled by u[0]
+        impulse = np.zeros(u.shape[-1])
+        impulse[0] = 1
+        xi0 = -Gamma1.reshape(-1, 1)
+        b_free, _ = ss2tf(Phi, Phi @ xi0, C, C @ xi0)
+        free = lfilter(b_free[0], a, impulse)
+        return forced + u[..., :1] * free
+
+def _as_tf(system):
+    if isinstance(system, TransferFunction):
+        return system
+    return TransferFunction([system], [1.0])
+
+def first_order_lag(tau, gain=1.0):
+    """gain / (tau s + 1)"""
+    return TransferFunction([gain], [tau, 1.0])
+
+def second_order(omega_n, zeta, gain=1.0):
+    """gain omega_n^2 / (s^2 + 2 zeta omega_n s + omega_n^2)"""
+    return TransferFunction([gain * omega_n ** 2], [1.0, 2 * zeta * omega_n, omega_n ** 2])
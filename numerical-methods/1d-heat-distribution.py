@@ -1,51 +1,6 @@
 import numpy as np
 import matplotlib.pyplot as plt
-
-def solve_heat_equation(L, T, alpha, N, M, f):
-    # Parameters
-    h = L / N
-    k = T / M
-
-    # Create grid points
-    x = np.linspace(0, L, N+1)
-
-    # Create initial temperature distribution
-    u0 = f(x)
-
-    # Create coefficient matrices
-    A = np.zeros((N-1, N-1))
-    B = np.zeros((N-1, N-1))
-
-    # Populate the coefficient matrices
-    A[0, 0] = 1 + alpha * k / (2 * h**2)
-    A[0, 1] = -alpha * k / (2 * h**2)
-    B[0, 0] = 1 - alpha * k / (2 * h**2)
-    B[0, 1] = alpha * k / (2 * h**2)
-
-    for i in range(1, N-2):
-        A[i, i-1] = -alpha * k / (2 * h**2)
-        A[i, i] = 1 + alpha * k / h**2
-        A[i, i+1] = -alpha * k / (2 * h**2)
-
-        B[i, i-1] = alpha * k / (2 * h**2)
-        B[i, i] = 1 - alpha * k / h**2
-        B[i, i+1] = alpha * k / (2 * h**2)
-
-    A[N-2, N-3] = -alpha * k / (2 * h**2)
-    A[N-2, N-2] = 1 + alpha * k / h**2
-    B[N-2, N-3] = alpha * k / (2 * h**2)
-    B[N-2, N-2] = 1 - alpha * k / h**2
-
-    # Initialize solution matrix
-    U = np.zeros((N+1, M+1))
-    U[:, 0] = u0
-
-    # Solve the system iteratively
-    for j in range(M):
-        # Use matrix solver to find U at the next time step
-        U[1:N, j+1] = np.linalg.solve(A, np.dot(B, U[1:N, j]))
-
-    return x, U
+from heat_equation import solve_heat_equation_to_file
 
 # Example usage
 L = 1.0
@@ -53,6 +8,7 @@ T = 0.5
 alpha = 0.1
 N = 100  # Number of spatial grid points
 M = 1000  # Number of time steps
+every = 10  # Keep one snapshot every `every` time steps
 
 # Define initial temperature distribution function
 def f(x):
@@ -66,12 +22,14 @@ def f(x):
 
     return initial_temperature
 
-x, U = solve_heat_equation(L, T, alpha, N, M, f)
+# Stream decimated snapshots to disk instead of keeping every time step in memory
+x, times, _ = solve_heat_equation_to_file(L, T, alpha, N, M, f, "1d-heat-distribution.npy", every)
 
-# Plot the results using color map and annotations
+# Plot the results using color map and annotations, reading from the on-disk store
+snapshots = np.load("1d-heat-distribution.npy", mmap_mode="r")
 plt.figure()
-X, T = np.meshgrid(x, np.linspace(T, 0, M+1))
-plt.pcolormesh(X, T, U.T, shading='auto', cmap='hot')
+X, T = np.meshgrid(x, T - times)
+plt.pcolormesh(X, T, snapshots, shading='auto', cmap='hot')
 plt.colorbar(label='Temperature')
 plt.xlabel('x')
 plt.ylabel('Time')
@@ -0,0 +1,49 @@
+import time
+import numpy as np
+from heat_equation import heat_equation_snapshots, solve_heat_equation_adaptive
+
+# Adaptive step-doubling run versus fixed-step runs on the candle example.
+# Each fixed-step run doubles M until its final profile is at least as accurate
+# as the adaptive one, measured against a fine fixed-step reference solution.
+# The run is ten times the demo's length: once the spike has diffused away the
+# adaptive solver takes large steps while the fixed-step one cannot.
+L = 1.0
+T = 5.0
+alpha = 0.1
+N = 1000
+tolerances = [1e-3, 1e-4, 1e-5]
+
+def f(x):
+    return 10.0 * np.exp(-((x - 0.2 * L) ** 2) / 0.01)
+
+def final_profile(M):
+    """Final profile of a fixed-step run, streamed without keeping the history"""
+    for t, u in heat_equation_snapshots(L, T, alpha, N, M, f, every=M):
+        pass
+    return u
+
+reference = final_profile(2**16)
+
+def final_error(u):
+    return np.max(np.abs(u - reference))
+
+print(f"{'tol':>8} {'steps':>6} {'rejected':>9} {'factorized':>11} {'error':>9} {'time [s]':>9}"
+      f" | {'fixed M':>8} {'error':>9} {'time [s]':>9}")
+for tol in tolerances:
+    start = time.perf_counter()
+    x, times, U, stats = solve_heat_equation_adaptive(L, T, alpha, N, f, tol=tol)
+    adaptive_time = time.perf_counter() - start
+    adaptive_error = final_error(U[:, -1])
+
+    M = 16
+    while True:
+        start = time.perf_counter()
+        u_fixed = final_profile(M)
+        fixed_time = time.perf_counter() - start
+        fixed_error = final_error(u_fixed)
+        if fixed_error <= adaptive_error or M >= 2**15:
+            break
+        M *= 2
+
+    print(f"{tol:>8.0e} {stats['steps']:>6} {stats['rejections']:>9} {stats['factorizations']:>11}"
+          f" {adaptive_error:>9.2e} {adaptive_time:>9.3f} | {M:>8} {fixed_error:>9.2e} {fixed_time:>9.3f}")
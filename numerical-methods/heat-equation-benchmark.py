@@ -0,0 +1,28 @@
+import time
+import numpy as np
+from heat_equation import solve_heat_equation
+
+# Compare the dense and banded Crank-Nicolson engines on the candle example.
+# The dense path is O(N^3) per step, so it is timed over a few steps only and
+# reported per step; at N = 10 000 its two matrices alone need about 1.6 GB.
+L = 1.0
+alpha = 0.1
+k = 5e-4  # Time step, kept fixed so every run does the same physics per step
+grid_sizes = [100, 1_000, 10_000]
+banded_steps = 1000
+dense_steps = 3
+
+def f(x):
+    return 10.0 * np.exp(-((x - 0.2 * L) ** 2) / 0.01)
+
+def time_per_step(N, M, method):
+    start = time.perf_counter()
+    x, U = solve_heat_equation(L, k * M, alpha, N, M, f, method=method)
+    return (time.perf_counter() - start) / M, U
+
+print(f"{'N':>8} {'dense [ms/step]':>16} {'banded [ms/step]':>17} {'speed-up':>9} {'max diff':>10}")
+for N in grid_sizes:
+    dense, U_dense = time_per_step(N, dense_steps, "dense")
+    banded, U_banded = time_per_step(N, banded_steps, "banded")
+    diff = np.max(np.abs(U_dense - U_banded[:, :dense_steps + 1]))
+    print(f"{N:>8} {dense * 1e3:>16.3f} {banded * 1e3:>17.4f} {dense / banded:>8.0f}x {diff:>10.2e}")
@@ -0,0 +1,36 @@
+import time
+import numpy as np
+from heat_equation_nd import LU_MAX_UNKNOWNS, heat_equation_nd_snapshots
+
+# Scaling of the 2D/3D sparse Crank-Nicolson solver with grid size. "setup" is
+# the time to the first snapshot (assembly, plus the LU factorization on the
+# "lu" path); "step" is the average cost of one time step after that. The LU
+# path is skipped where method="auto" would not pick it: on large 3D grids its
+# fill-in alone exhausts memory.
+T = 0.01
+alpha = 0.1
+M = 20
+grids = [(64, 64), (128, 128), (256, 256), (512, 512), (1024, 1024),
+         (16, 16, 16), (24, 24, 24), (32, 32, 32), (64, 64, 64), (128, 128, 128)]
+
+def f(*coords):
+    # Candle-like hot spot at 0.2 along the first axis, centred on the others
+    r2 = (coords[0] - 0.2) ** 2 + sum((c - 0.5) ** 2 for c in coords[1:])
+    return 10.0 * np.exp(-r2 / 0.01)
+
+print(f"{'grid':>14} {'unknowns':>10} {'method':>6} {'setup [s]':>10} {'step [ms]':>10}")
+for N in grids:
+    unknowns = np.prod([n - 1 for n in N])
+    for method in ("cg", "lu"):
+        if method == "lu" and unknowns > LU_MAX_UNKNOWNS[len(N)]:
+            print(f"{'x'.join(map(str, N)):>14} {unknowns:>10} {method:>6} {'-':>10} {'-':>10}")
+            continue
+        snapshots = heat_equation_nd_snapshots(1.0, T, alpha, N, M, f, method=method)
+        start = time.perf_counter()
+        next(snapshots)
+        setup = time.perf_counter() - start
+        start = time.perf_counter()
+        for t, u in snapshots:
+            pass
+        step = (time.perf_counter() - start) / M
+        print(f"{'x'.join(map(str, N)):>14} {unknowns:>10} {method:>6} {setup:>10.3f} {step * 1e3:>10.2f}")
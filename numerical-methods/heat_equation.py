@@ -0,0 +1,220 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy.linalg import lapack
+
+# Crank-Nicolson solvers for the 1D heat equation u_t = alpha * u_xx
+# with the ends held at zero temperature.
+
+def crank_nicolson_diagonals(n, r):
+    """Return the (lower, main, upper) diagonals of the A and B matrices, r = alpha*k/h**2"""
+    a_main = np.full(n, 1 + r)
+    b_main = np.full(n, 1 - r)
+    if n > 1:
+        a_main[0] = 1 + r / 2
+        b_main[0] = 1 - r / 2
+    a_off = np.full(n - 1, -r / 2)
+    b_off = np.full(n - 1, r / 2)
+    return (a_off, a_main, a_off), (b_off, b_main, b_off)
+
+def tridiagonal_matvec(lower, main, upper, v):
+    """Multiply a tridiagonal matrix, stored as its three diagonals, by v"""
+    out = main * v
+    out[1:] += lower * v[:-1]
+    out[:-1] += upper * v[1:]
+    return out
+
+class TridiagonalLU:
+    """LU factorization of a tridiagonal matrix, computed once and reused for every solve"""
+
+    def __init__(self, lower, main, upper):
+        self.dl, self.d, self.du, self.du2, self.ipiv, info = lapack.dgttrf(lower, main, upper)
+        if info != 0:
+            raise np.linalg.LinAlgError("Tridiagonal matrix is singular")
+
+    def solve(self, rhs):
+        b = rhs.reshape(len(self.d), -1)
+        x, info = lapack.dgttrs(self.dl, self.d, self.du, self.du2, self.ipiv, b)
+        return x.reshape(rhs.shape)
+
+def dense_matrices(N, r):
+    """Build the full (N-1)x(N-1) A and B matrices (reference implementation)"""
+    (al, am, au), (bl, bm, bu) = crank_nicolson_diagonals(N - 1, r)
+    A = np.diag(am) + np.diag(al, -1) + np.diag(au, 1)
+    B = np.diag(bm) + np.diag(bl, -1) + np.diag(bu, 1)
+    return A, B
+
+def crank_nicolson_stepper(N, r, method="banded"):
+    """Return a function that advances the interior temperatures by one time step"""
+    if method == "dense":
+        # O(N^3) per step: full matrices, re-solved from scratch every step
+        A, B = dense_matrices(N, r)
+        return lambda u: np.linalg.solve(A, np.dot(B, u))
+    if method == "banded":
+        # O(N) per step: A is constant, so factorize it once and reuse the LU
+        (al, am, au), (bl, bm, bu) = crank_nicolson_diagonals(N - 1, r)
+        lu = TridiagonalLU(al, am, au)
+        return lambda u: lu.solve(tridiagonal_matvec(bl, bm, bu, u))
+    raise ValueError(f"Unknown method {method!r}, expected 'banded' or 'dense'")
+
+def snapshot_steps(M, every):
+    """Time-step indices kept when saving every `every` steps (the last step is always kept)"""
+    return np.unique(np.append(np.arange(0, M + 1, every), M))
+
+def heat_equation_snapshots(L, T, alpha, N, M, f, every=1, method="banded"):
+    """Yield (t, u) every `every` steps while holding only two time levels in memory.
+
+    The yielded array is reused for the following steps, so copy it if you keep it.
+    """
+    h = L / N
+    k = T / M
+    step = crank_nicolson_stepper(N, alpha * k / h**2, method)
+
+    u = np.array(f(np.linspace(0, L, N+1)), dtype=float)
+    u_next = np.zeros(N+1)
+    yield 0.0, u
+    for j in range(1, M + 1):
+        u_next[1:N] = step(u[1:N])
+        u, u_next = u_next, u
+        u_next[[0, N]] = 0.0  # Ends are held at zero after the initial profile
+        if j % every == 0 or j == M:
+            yield j * k, u
+
+def solve_heat_equation(L, T, alpha, N, M, f, method="banded"):
+    x = np.linspace(0, L, N+1)
+    U = np.zeros((N+1, M+1))
+    for j, (t, u) in enumerate(heat_equation_snapshots(L, T, alpha, N, M, f, method=method)):
+        U[:, j] = u
+    return x, U
+
+def solve_heat_equation_to_file(L, T, alpha, N, M, f, path, every=1, method="banded"):
+    """Stream snapshots every `every` steps into a memory-mapped .npy file on disk.
+
+    Returns the grid, the snapshot times and the (n_snapshots, N+1) memory-mapped store.
+    """
+    x = np.linspace(0, L, N+1)
+    times = snapshot_steps(M, every) * (T / M)
+    store = np.lib.format.open_memmap(path, mode="w+", dtype=float, shape=(len(times), N+1))
+    for i, (t, u) in enumerate(heat_equation_snapshots(L, T, alpha, N, M, f, every, method)):
+        store[i] = u
+    store.flush()
+    return x, times, store
+
+def solve_heat_equation_adaptive(L, T, alpha, N, f, tol=1e-4, k0=None):
+    """Crank-Nicolson with step-doubling error control.
+
+    Each attempt takes one step of size k and two of size k/2; their difference
+    estimates the local error, and the more accurate two-half-step result is kept.
+    Step sizes only halve or double (apart from the last one, trimmed to land on T),
+    so the banded factorizations are cached per step size and rebuilt only when a
+    new size is used. Returns x, the accepted times, U with one column per accepted
+    time, and a dict with the number of steps, rejections and factorizations.
+    """
+    h = L / N
+    x = np.linspace(0, L, N+1)
+    steppers = {}
+    stats = {"steps": 0, "rejections": 0, "factorizations": 0}
+
+    def step(u, k):
+        if k not in steppers:
+            steppers[k] = crank_nicolson_stepper(N, alpha * k / h**2)
+            stats["factorizations"] += 1
+        u_next = np.zeros(N+1)
+        u_next[1:N] = steppers[k](u[1:N])
+        return u_next
+
+    k = T / 1000 if k0 is None else k0
+    t = 0.0
+    u = np.array(f(x), dtype=float)
+    times = [t]
+    states = [u]
+    while T - t > 1e-12 * T:
+        k_try = min(k, T - t)
+        full = step(u, k_try)
+        half = step(step(u, k_try / 2), k_try / 2)
+        # CN is second order, so the two-half-step result is off by about a third of the difference
+        error = np.max(np.abs(half - full)) / 3
+        # Safety-factored step ratio that would bring the error to exactly tol
+        ratio = 0.9 * (tol / error) ** (1 / 3) if error > 0 else np.inf
+        if error <= tol:
+            t += k_try
+            u = half
+            times.append(t)
+            states.append(u)
+            stats["steps"] += 1
+            if ratio >= 2 and k_try == k:
+                k *= 2
+        else:
+            stats["rejections"] += 1
+            k = k_try / 2 ** min(4, int(np.ceil(-np.log2(ratio))))
+
+    return x, np.array(times), np.column_stack(states), stats
+
+def batch_crank_nicolson_stepper(N, r):
+    """Return a function that advances a (B, N-1) batch of interior temperatures by one step.
+
+    Each run b has its own r[b]. The B tridiagonal systems are laid end to end as one
+    block-diagonal tridiagonal system (with zero coupling between blocks), so one LAPACK
+    factorization and one solve per step cover the whole batch.
+    """
+    A_diagonals, B_diagonals = zip(*[crank_nicolson_diagonals(N - 1, r_b) for r_b in np.atleast_1d(r)])
+
+    def block(diagonals):
+        lower, main, upper = zip(*diagonals)
+        gap = np.zeros(1)
+        return (np.concatenate([d for off in lower for d in (off, gap)])[:-1],
+                np.concatenate(main),
+                np.concatenate([d for off in upper for d in (off, gap)])[:-1])
+
+    lu = TridiagonalLU(*block(A_diagonals))
+    bl, bm, bu = block(B_diagonals)
+    return lambda u: lu.solve(tridiagonal_matvec(bl, bm, bu, u.ravel())).reshape(u.shape)
+
+def _broadcast_runs(alpha, U0):
+    """Diffusivities (B,) and initial profiles (B, N+1), broadcast to a common number of runs"""
+    alpha, U0 = np.broadcast_arrays(np.atleast_1d(np.asarray(alpha, dtype=float))[:, None],
+                                    np.array(U0, dtype=float, ndmin=2))
+    return alpha[:, 0], U0
+
+def heat_equation_batch_snapshots(L, T, alpha, N, M, u0, every=1):
+    """Yield (t, U) every `every` steps for a batch of runs, U with shape (B, N+1).
+
+    alpha is a diffusivity or one per run; u0 is either a function f(x) shared by
+    every run or an array of initial profiles, one row per run. A single diffusivity
+    or profile is shared by every run. The yielded array is reused for the following
+    steps, so copy it if you keep it.
+    """
+    h = L / N
+    k = T / M
+    x = np.linspace(0, L, N+1)
+    alpha, U = _broadcast_runs(alpha, u0(x) if callable(u0) else u0)
+    U = np.array(U)
+    step = batch_crank_nicolson_stepper(N, alpha * k / h**2)
+
+    yield 0.0, U
+    U[:, [0, N]] = 0.0  # Ends are held at zero after the initial profile
+    for j in range(1, M + 1):
+        U[:, 1:N] = step(U[:, 1:N])
+        if j % every == 0 or j == M:
+            yield j * k, U
+
+def _final_batch(args):
+    for t, U in heat_equation_batch_snapshots(*args):
+        pass
+    return U
+
+def solve_heat_equation_batch(L, T, alpha, N, M, u0, workers=None, chunk_size=256):
+    """Advance a sweep of diffusivities and initial profiles together and return x and the final U.
+
+    With workers > 1, the batch is split into chunks of `chunk_size` runs that are solved
+    in a process pool. u0 is evaluated here, so only arrays are sent to the workers.
+    """
+    x = np.linspace(0, L, N+1)
+    alpha, U0 = _broadcast_runs(alpha, u0(x) if callable(u0) else u0)
+
+    if not workers or workers == 1 or len(alpha) <= chunk_size:
+        return x, _final_batch((L, T, alpha, N, M, U0, M))
+
+    chunks = [(L, T, alpha[i:i + chunk_size], N, M, U0[i:i + chunk_size], M)
+              for i in range(0, len(alpha), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return x, np.concatenate(list(pool.map(_final_batch, chunks)))
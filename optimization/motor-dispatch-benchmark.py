@@ -0,0 +1,44 @@
+import time
+import numpy as np
+from scipy.optimize import linprog
+from motor_dispatch import DispatchModel
+
+# A plant of n motors on feeders of 100 motors with a supply limit each, production
+# lines of 50 motors with a throughput demand each, and neighbouring motors on a
+# line coupled to within 5 rpm of each other. Dense assembly in the style of the
+# original script (speed limits as constraint rows) against the sparse builder.
+
+def plant(n, seed=0):
+    rng = np.random.default_rng(seed)
+    cost = rng.uniform(5, 25, n)
+    speed_max = rng.uniform(50, 150, n)
+    power = rng.uniform(0.5, 1.5, n)
+    throughput = rng.uniform(0.8, 1.2, n)
+    feeder = np.arange(n) // 100
+    line = np.arange(n) // 50
+    i = np.flatnonzero(line[:-1] == line[1:])
+    model = DispatchModel(cost, 0.0, speed_max)
+    model.add_supply_limit(feeder, power, np.full(feeder[-1] + 1, 6000.0))
+    model.add_demand(line, throughput, np.full(line[-1] + 1, 2000.0))
+    model.add_coupling(i, i + 1, 5.0)
+    return model
+
+def solve_dense(model):
+    A_ub, b_ub = model.constraints()
+    n = model.n
+    A = np.vstack([A_ub.toarray(), np.eye(n), -np.eye(n)])
+    b = np.concatenate([b_ub, model.speed_max, -model.speed_min])
+    return linprog(model.cost, A_ub=A, b_ub=b, method="highs")
+
+for n in (1000, 2000, 10_000, 100_000):
+    start = time.perf_counter()
+    model = plant(n)
+    result = model.solve()
+    sparse_time = time.perf_counter() - start
+    line = f"n = {n:6d}: sparse {sparse_time:7.3f} s (status {result.status}, cost {result.fun:.6g})"
+    # The dense form needs (n_rows + 2n) x n doubles, about 3 GB at n = 10^4
+    if n <= 2000:
+        start = time.perf_counter()
+        dense = solve_dense(plant(n))
+        line += f", dense {time.perf_counter() - start:7.3f} s (cost {dense.fun:.6g})"
+    print(line)
@@ -0,0 +1,49 @@
+import time
+import numpy as np
+from scipy.optimize import linprog
+from motor_dispatch import DispatchModel, DispatchOptimizer
+
+# Rolling re-optimization of a 10^4-motor plant: every tick the tariffs drift by
+# about 1% and the plant is re-dispatched. A cold linprog per tick against the
+# persistent optimizer, which only sends the new costs and restarts from the last
+# basis. The deadline is the control-loop period the solves have to fit in.
+n = 10_000
+ticks = 20
+deadline = 0.1
+
+rng = np.random.default_rng(0)
+cost = rng.uniform(5, 25, n)
+speed_max = rng.uniform(50, 150, n)
+feeder = np.arange(n) // 100
+line = np.arange(n) // 50
+i = np.flatnonzero(line[:-1] == line[1:])
+model = DispatchModel(cost, 0.0, speed_max)
+model.add_supply_limit(feeder, rng.uniform(0.5, 1.5, n), np.full(feeder[-1] + 1, 6000.0))
+model.add_demand(line, rng.uniform(0.8, 1.2, n), np.full(line[-1] + 1, 2000.0))
+model.add_coupling(i, i + 1, 5.0)
+A_ub, b_ub = model.constraints()
+
+costs = cost * np.cumprod(1 + 0.01 * rng.standard_normal((ticks, n)), axis=0)
+
+cold_times, cold_objectives = [], []
+for c in costs:
+    start = time.perf_counter()
+    result = linprog(c, A_ub=A_ub, b_ub=b_ub, bounds=model.bounds, method="highs")
+    cold_times.append(time.perf_counter() - start)
+    cold_objectives.append(result.fun)
+
+optimizer = DispatchOptimizer(model)
+optimizer.solve()
+results = [optimizer.solve(cost=c) for c in costs]
+warm_times = [r.time for r in results]
+iterations = [r.nit for r in results]
+
+print(f"Cold linprog:  median {np.median(cold_times) * 1e3:7.1f} ms, max {np.max(cold_times) * 1e3:7.1f} ms")
+label = "Warm restart: " if results[-1].warm_start else "Optimizer*:   "
+print(f"{label} median {np.median(warm_times) * 1e3:7.1f} ms, max {np.max(warm_times) * 1e3:7.1f} ms, "
+      f"{np.median(iterations):.0f} iterations (cold start {optimizer.history[0]['iterations']})")
+print(f"Ticks over the {deadline * 1e3:.0f} ms deadline: cold {np.sum(np.array(cold_times) > deadline)}, "
+      f"warm {np.sum(np.array(warm_times) > deadline)}")
+if not results[-1].warm_start:
+    print("* highspy is not installed, so the optimizer re-solves every tick cold with linprog")
+print(f"Max objective difference: {np.max(np.abs(np.array([r.fun for r in results]) - cold_objectives)):.2e}")
@@ -1,5 +1,5 @@
 import numpy as np
-from scipy.optimize import linprog
+from motor_dispatch import DispatchModel
 
 # Sample power consumption functions: P1(x1) = c1 * x1, P2(x2) = c2 * x2
 c1, c2 = 10, 20
@@ -8,17 +8,14 @@ c1, c2 = 10, 20
 x1_min, x1_max = 0, 100
 x2_min, x2_max = 0, 50
 
-# Define the coefficients for the objective function
-c = [c1, c2]
-
-# Define the inequality constraints matrix and vector
-A = [[1, 0], [0, 1], [-1, 0], [0, -1]]
-b = [x1_max, x2_max, -x1_min, -x2_min]
+# The speed limits are the variable bounds of the LP; shared supply, demand and
+# coupling constraints between motors would be added to the model here
+model = DispatchModel(cost=[c1, c2], speed_min=[x1_min, x2_min], speed_max=[x1_max, x2_max])
 
 # Solve the linear programming problem
-result = linprog(c, A_ub=A, b_ub=b)
+result = model.solve()
 
 # Extract the optimal solution
 optimal_solution = result.x
 
-print("Optimal solution:", optimal_solution)
\ No newline at end of file
+print("Optimal solution:", optimal_solution)
@@ -0,0 +1,72 @@
+import time
+import numpy as np
+from scipy.optimize import LinearConstraint, minimize
+from motor_dispatch import DispatchModel, highs_solver
+from motor_power import PolynomialPower, solve_power_dispatch
+
+# Cubic (fan/pump law) power curves P_i(x) = a_i x + b_i x^2 + c_i x^3 on the plant
+# of motor-dispatch-benchmark.py. SLSQP with one Python power function per motor
+# against the vectorized solvers: the interior-point method and the LP on the
+# linearized curves.
+
+def plant(n, seed=0):
+    rng = np.random.default_rng(seed)
+    speed_max = rng.uniform(50, 150, n)
+    feeder = np.arange(n) // 100
+    line = np.arange(n) // 50
+    i = np.flatnonzero(line[:-1] == line[1:])
+    model = DispatchModel(0.0 * speed_max, 0.0, speed_max)
+    model.add_supply_limit(feeder, rng.uniform(0.5, 1.5, n), np.full(feeder[-1] + 1, 6000.0))
+    model.add_demand(line, rng.uniform(0.8, 1.2, n), np.full(line[-1] + 1, 2000.0))
+    model.add_coupling(i, i + 1, 5.0)
+    power = PolynomialPower(rng.uniform(5, 25, n), rng.uniform(0.01, 0.1, n), rng.uniform(1e-4, 1e-3, n))
+    return model, power
+
+def solve_per_motor(model, power):
+    motors = [lambda x, a=a, b=b, c=c: a * x + b * x ** 2 + c * x ** 3
+              for a, b, c in zip(power.linear, power.quadratic, power.cubic)]
+    A_ub, b_ub = model.constraints()
+    return minimize(lambda x: sum(P(xi) for P, xi in zip(motors, x)), model.speed_max / 2, method="SLSQP",
+                    bounds=model.bounds, constraints=[LinearConstraint(A_ub.toarray(), -np.inf, b_ub)],
+                    options={"maxiter": 1000})
+
+for n in (100, 1000, 10_000):
+    model, power = plant(n)
+    line = f"n = {n:6d}:"
+    for method in ("ipm", "lp"):
+        start = time.perf_counter()
+        result = solve_power_dispatch(model, power, method, segments=32)
+        line += f"  {method} {time.perf_counter() - start:6.2f} s ({result.fun:.8g})"
+    if n <= 100:
+        start = time.perf_counter()
+        result = solve_per_motor(model, power)
+        line += f"  per-motor SLSQP {time.perf_counter() - start:6.2f} s ({result.fun:.8g})"
+    print(line)
+
+# A plant-wide demand row couples every motor; the interior-point method keeps it
+# out of its sparse factorization, so it scales as without it (the LP, whose
+# simplex iterations all pass through that row, is only timed at 3000 motors)
+for n in (3000, 10_000):
+    model, power = plant(n)
+    model.add_demand(np.zeros(n, dtype=int), 1.0, [44.0 * n])
+    line = f"n = {n:6d}, plant-wide demand:"
+    for method in ("ipm", "lp") if n <= 3000 else ("ipm",):
+        start = time.perf_counter()
+        result = solve_power_dispatch(model, power, method, segments=32)
+        assert result.success, result.message
+        line += f"  {method} {time.perf_counter() - start:6.2f} s ({result.fun:.8g})"
+    print(line)
+
+# An infeasible plant (demand beyond the supply limits) fails the same way for every
+# method, and the exact QP takes scalar coefficients shared by all motors
+model, power = plant(3000)
+model.add_demand(np.zeros(3000, dtype=int), 1.0, [1e7])
+quadratic = PolynomialPower(10.0, 0.05)
+methods = ("lp", "qp", "ipm") if highs_solver() is not None else ("lp", "ipm")
+statuses = {method: solve_power_dispatch(model, quadratic, method).status for method in methods}
+assert set(statuses.values()) == {2}, statuses
+print(f"Infeasible plant, status per method: {statuses}")
+model, _ = plant(1000)
+results = {method: solve_power_dispatch(model, quadratic, method) for method in methods}
+assert all(result.success for result in results.values())
+print("Scalar coefficients: " + ", ".join(f"{method} {result.fun:.8g}" for method, result in results.items()))
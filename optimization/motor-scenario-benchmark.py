@@ -0,0 +1,55 @@
+import time
+import numpy as np
+from scipy.optimize import linprog
+from motor_dispatch import DispatchModel
+from motor_scenarios import clear_result_cache, run_scenarios
+
+# Monte Carlo sizing study on a 500-motor plant: a demand level (in 2% steps) and a
+# tariff band per feeder drawn for every scenario, so that some scenarios repeat.
+# A linprog loop against the scenario engine, cold and with the result cache warm
+# from the first run.
+
+def main():
+    n = 500
+    n_scenarios = 2000
+    workers = 2
+
+    rng = np.random.default_rng(0)
+    speed_max = rng.uniform(50, 150, n)
+    feeder = np.arange(n) // 100
+    line = np.arange(n) // 50
+    i = np.flatnonzero(line[:-1] == line[1:])
+    model = DispatchModel(rng.uniform(5, 25, n), 0.0, speed_max)
+    model.add_supply_limit(feeder, rng.uniform(0.5, 1.5, n), np.full(feeder[-1] + 1, 6000.0))
+    model.add_demand(line, rng.uniform(0.8, 1.2, n), np.full(line[-1] + 1, 2000.0))
+    model.add_coupling(i, i + 1, 5.0)
+    A_ub, b_ub = model.constraints()
+
+    demand_rows = slice(feeder[-1] + 1, feeder[-1] + 1 + line[-1] + 1)
+    level = np.round(rng.uniform(0.7, 1.3, n_scenarios) / 0.02) * 0.02
+    tariff = rng.choice([0.8, 1.0, 1.25], (n_scenarios, feeder[-1] + 1))
+    costs = tariff[:, feeder] * model.cost
+    limits = np.tile(b_ub, (n_scenarios, 1))
+    limits[:, demand_rows] *= level[:, None]
+
+    n_loop = 200
+    start = time.perf_counter()
+    loop = [linprog(costs[k], A_ub=A_ub, b_ub=limits[k], bounds=model.bounds, method="highs") for k in range(n_loop)]
+    loop_rate = n_loop / (time.perf_counter() - start)
+    print(f"linprog loop: {loop_rate:10.1f} scenarios/s")
+
+    clear_result_cache()
+    runs = (("engine, serial", {}), ("engine, cached", {}), (f"engine, {workers} workers", {"workers": workers}))
+    for label, kwargs in runs:
+        if "workers" in kwargs:
+            clear_result_cache()
+        results, stats = run_scenarios(model, costs, limits, chunk_size=64, **kwargs)
+        rate = stats["scenarios_per_second"]
+        print(f"{label:20s} {rate:10.1f} scenarios/s ({rate / loop_rate:.0f}x), "
+              f"{stats['distinct']} distinct, {stats['solves']} solved")
+
+    print(f"Max objective difference: {np.max(np.abs(results['objective'][:n_loop] - [r.fun for r in loop])):.2e}")
+    print(f"Infeasible scenarios: {np.sum(results['status'] == 2)}")
+
+if __name__ == "__main__":
+    main()
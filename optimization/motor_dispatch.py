@@ -0,0 +1,210 @@
+import time
+import numpy as np
+from scipy.optimize import OptimizeResult, linprog
+from scipy.sparse import coo_matrix, csr_matrix, vstack
+
+# Motor dispatch as a linear program: choose the speeds x of n motors to minimize
+# total power sum_i c_i x_i.
+#
+# Speed limits are passed to the solver as variable bounds, not as constraint rows,
+# and every coupling constraint is assembled from index arrays straight into a
+# sparse matrix, so memory and assembly time grow with the number of nonzeros
+# rather than with n^2. HiGHS solves the result.
+#
+# For rolling re-optimization, DispatchOptimizer keeps one HiGHS instance (from the
+# highspy package) with the model loaded, applies only the costs and limits that
+# changed, and lets the dual simplex restart from the previous optimal basis.
+
+class DispatchModel:
+    """Builder for the motor dispatch LP.
+
+    cost, speed_min and speed_max are arrays with one entry per motor (scalars
+    broadcast). Constraints shared between motors are added with the add_* methods,
+    each of which takes whole arrays and adds a block of sparse rows at once.
+    """
+
+    def __init__(self, cost, speed_min=0.0, speed_max=np.inf):
+        self.cost, self.speed_min, self.speed_max = (
+            np.array(a, dtype=float) for a in np.broadcast_arrays(cost, speed_min, speed_max))
+        self.n = len(self.cost)
+        self._blocks = []
+        self._limits = []
+
+    def _add_rows(self, rows, cols, values, limits):
+        limits = np.atleast_1d(np.asarray(limits, dtype=float))
+        self._blocks.append(coo_matrix((values, (rows, cols)), shape=(len(limits), self.n)))
+        self._limits.append(limits)
+        return self
+
+    def _group_rows(self, group, weight):
+        group = np.asarray(group)
+        weight = np.broadcast_to(np.asarray(weight, dtype=float), group.shape)
+        # Motors with a negative group index take part in none of the rows
+        member = group >= 0
+        return group[member], np.flatnonzero(member), weight[member]
+
+    def add_supply_limit(self, group, power, capacity):
+        """sum of power_i x_i over the motors of each group <= capacity[group].
+
+        group holds each motor's group index (e.g. its feeder), or -1 for none.
+        """
+        rows, cols, values = self._group_rows(group, power)
+        return self._add_rows(rows, cols, values, capacity)
+
+    def add_demand(self, group, throughput, demand):
+        """sum of throughput_i x_i over the motors of each group >= demand[group]"""
+        rows, cols, values = self._group_rows(group, throughput)
+        return self._add_rows(rows, cols, -values, -np.asarray(demand, dtype=float))
+
+    def add_coupling(self, i, j, max_difference):
+        """|x_i - x_j| <= max_difference for every pair (i[k], j[k])"""
+        i, j = np.atleast_1d(i), np.atleast_1d(j)
+        d = np.broadcast_to(np.asarray(max_difference, dtype=float), i.shape)
+        k = np.arange(len(i))
+        rows = np.concatenate([k, k, len(i) + k, len(i) + k])
+        cols = np.concatenate([i, j, j, i])
+        values = np.repeat([1.0, -1.0, 1.0, -1.0], len(i))
+        return self._add_rows(rows, cols, values, np.concatenate([d, d]))
+
+    def add_constraints(self, A, limits):
+        """Arbitrary rows A x <= limits, with A any (sparse or dense) matrix of n columns"""
+        A = coo_matrix(A)
+        return self._add_rows(A.row, A.col, A.data, limits)
+
+    def constraints(self):
+        """(A_ub, b_ub) of all added constraints, A_ub as a CSR matrix"""
+        if not self._blocks:
+            return csr_matrix((0, self.n)), np.zeros(0)
+        return vstack(self._blocks, format="csr"), np.concatenate(self._limits)
+
+    @property
+    def bounds(self):
+        return np.column_stack([self.speed_min, self.speed_max])
+
+    def solve(self, method="highs", **options):
+        """linprog result for the model. method is "highs" (HiGHS picks the algorithm),
+        "highs-ds" (dual simplex) or "highs-ipm" (interior point, for the largest models)."""
+        A_ub, b_ub = self.constraints()
+        return linprog(self.cost, A_ub=A_ub if A_ub.shape[0] else None, b_ub=b_ub if len(b_ub) else None,
+                       bounds=self.bounds, method=method, options=options or None)
+
+def highs_solver():
+    """The highspy module (the HiGHS bindings), or None when it is not installed"""
+    try:
+        import highspy
+    except ImportError:
+        return None
+    return highspy
+
+# linprog's status codes for the HiGHS model statuses
+STATUS = {"kOptimal": 0, "kIterationLimit": 1, "kTimeLimit": 1, "kInfeasible": 2,
+          "kUnbounded": 3, "kUnboundedOrInfeasible": 3}
+
+def _highs_lp(highspy, n, cost, lower, upper, A, b_ub):
+    """HighsLp of min cost x s.t. A x <= b_ub, lower <= x <= upper, with A in CSC format"""
+    lp = highspy.HighsLp()
+    lp.num_col_, lp.num_row_ = n, A.shape[0]
+    lp.col_cost_, lp.col_lower_, lp.col_upper_ = cost, lower, upper
+    lp.row_lower_, lp.row_upper_ = np.full(A.shape[0], -np.inf), b_ub
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+    lp.a_matrix_.num_col_, lp.a_matrix_.num_row_ = A.shape[1], A.shape[0]
+    lp.a_matrix_.start_, lp.a_matrix_.index_, lp.a_matrix_.value_ = A.indptr, A.indices, A.data
+    return lp
+
+class DispatchOptimizer:
+    """Persistent, warm-started solver for a DispatchModel whose parameters change over time.
+
+    The constraint matrix is fixed when the optimizer is created. solve() takes new
+    costs, speed limits or constraint limits, passes only the entries that differ
+    from the previous solve to HiGHS, and re-solves from the last optimal basis.
+    Every result carries the solve time and the simplex iteration count, which are
+    also appended to `history`.
+
+    The persistent instance needs the highspy package. Without it every solve()
+    is a cold linprog(method="highs-ds") on the current parameters, with the same
+    results but no warm start.
+    """
+
+    def __init__(self, model, **options):
+        A_ub, b_ub = model.constraints()
+        self.cost = model.cost.copy()
+        self.speed_min, self.speed_max = model.speed_min.copy(), model.speed_max.copy()
+        self.limits = b_ub.copy()
+        self.history = []
+
+        highspy = highs_solver()
+        if highspy is None:
+            self._highs = None
+            self._A_ub, self._options = A_ub, options
+            return
+        self._highs = highspy.Highs()
+        self._highs.setOptionValue("output_flag", False)
+        # Dual simplex, the algorithm that can restart from a previous basis
+        self._highs.setOptionValue("solver", "simplex")
+        for name, value in options.items():
+            self._highs.setOptionValue(name, value)
+        self._highs.passModel(_highs_lp(highspy, model.n, model.cost, model.speed_min, model.speed_max,
+                                        A_ub.tocsc(), b_ub))
+
+    def update(self, cost=None, speed_min=None, speed_max=None, limits=None):
+        """Apply new parameters (arrays or scalars), sending only the changed entries"""
+        if cost is not None:
+            cost = np.broadcast_to(np.asarray(cost, dtype=float), self.cost.shape)
+            changed = np.flatnonzero(cost != self.cost)
+            if len(changed) and self._highs is not None:
+                self._highs.changeColsCost(len(changed), changed.astype(np.int32), cost[changed])
+            self.cost[changed] = cost[changed]
+        if speed_min is not None or speed_max is not None:
+            shape = self.cost.shape
+            lower = self.speed_min if speed_min is None else np.broadcast_to(np.asarray(speed_min, dtype=float), shape)
+            upper = self.speed_max if speed_max is None else np.broadcast_to(np.asarray(speed_max, dtype=float), shape)
+            changed = np.flatnonzero((lower != self.speed_min) | (upper != self.speed_max))
+            if len(changed) and self._highs is not None:
+                self._highs.changeColsBounds(len(changed), changed.astype(np.int32), lower[changed], upper[changed])
+            self.speed_min[changed], self.speed_max[changed] = lower[changed], upper[changed]
+        if limits is not None:
+            limits = np.broadcast_to(np.asarray(limits, dtype=float), self.limits.shape)
+            # Constraint limits change rarely and a few at a time, so one call per row
+            for row in np.flatnonzero(limits != self.limits).tolist():
+                if self._highs is not None:
+                    self._highs.changeRowBounds(row, -np.inf, limits[row])
+                self.limits[row] = limits[row]
+        return self
+
+    def solve(self, cost=None, speed_min=None, speed_max=None, limits=None):
+        """Re-solve after update(); returns an OptimizeResult like linprog's, plus time and warm_start"""
+        self.update(cost, speed_min, speed_max, limits)
+        if self._highs is None:
+            return self._solve_cold()
+        warm_start = bool(self.history)
+        start = time.perf_counter()
+        self._highs.run()
+        elapsed = time.perf_counter() - start
+
+        info = self._highs.getInfo()
+        status = self._highs.getModelStatus()
+        name = status.name if hasattr(status, "name") else str(status).rsplit(".", 1)[-1]
+        result = OptimizeResult(
+            x=np.array(self._highs.getSolution().col_value),
+            fun=info.objective_function_value,
+            status=STATUS.get(name, 4),
+            message=self._highs.modelStatusToString(status),
+            nit=info.simplex_iteration_count,
+            time=elapsed,
+            warm_start=warm_start,
+        )
+        result.success = result.status == 0
+        self.history.append({"time": elapsed, "iterations": result.nit, "warm_start": warm_start})
+        return result
+
+    def _solve_cold(self):
+        """solve() without highspy: one linprog call on the current parameters"""
+        A_ub = self._A_ub if self._A_ub.shape[0] else None
+        start = time.perf_counter()
+        result = linprog(self.cost, A_ub=A_ub, b_ub=self.limits if A_ub is not None else None,
+                         bounds=np.column_stack([self.speed_min, self.speed_max]), method="highs-ds",
+                         options=self._options or None)
+        result.time = time.perf_counter() - start
+        result.warm_start = False
+        self.history.append({"time": result.time, "iterations": result.nit, "warm_start": False})
+        return result
@@ -0,0 +1,275 @@
+import numpy as np
+from scipy.optimize import OptimizeResult, linprog
+from scipy.sparse import csc_matrix, diags, eye, vstack
+from scipy.sparse.linalg import splu
+from motor_dispatch import STATUS, highs_solver
+
+# Nonlinear motor power curves for the dispatch problem: minimize sum_i P_i(x_i)
+# over the bounds and constraints of a DispatchModel, for convex P_i.
+#
+# Every curve evaluates all motors at once, so the solvers never call back into
+# Python per motor:
+# - "lp":  piecewise-linear curves (polynomials are linearized first) as an LP in
+#          one variable per segment, exact for the piecewise-linear curve;
+# - "qp":  quadratic curves as an exact convex QP, solved by HiGHS;
+# - "ipm": a primal-dual interior-point method for any smooth convex curve,
+#          whose Newton systems are sparse because the objective is separable.
+
+# "auto" solves quadratic curves exactly as a QP up to this many motors
+QP_MAX_MOTORS = 1000
+
+# The interior-point method treats constraint rows with more nonzeros than this
+# fraction of the motors as dense
+DENSE_ROW_FRACTION = 0.1
+
+class PolynomialPower:
+    """P_i(x) = linear_i x + quadratic_i x^2 + cubic_i x^3, one coefficient per motor.
+
+    Convex on the speed range when quadratic, cubic >= 0 and the speeds are >= 0,
+    as for fan and pump (affinity law) loads.
+    """
+
+    def __init__(self, linear=0.0, quadratic=0.0, cubic=0.0):
+        self.linear, self.quadratic, self.cubic = (
+            np.array(a, dtype=float) for a in np.broadcast_arrays(linear, quadratic, cubic))
+
+    def __call__(self, x):
+        return ((self.cubic * x + self.quadratic) * x + self.linear) * x
+
+    def gradient(self, x):
+        return (3 * self.cubic * x + 2 * self.quadratic) * x + self.linear
+
+    def hessian(self, x):
+        """Diagonal of the Hessian of sum_i P_i(x_i)"""
+        return 6 * self.cubic * x + 2 * self.quadratic
+
+class PiecewiseLinearPower:
+    """P_i interpolated linearly between breakpoints[i] and values[i], arrays of shape (n, K).
+
+    The slopes must increase along each row (a convex curve).
+    """
+
+    def __init__(self, breakpoints, values):
+        self.breakpoints = np.asarray(breakpoints, dtype=float)
+        self.values = np.asarray(values, dtype=float)
+        self.slopes = np.diff(self.values, axis=1) / np.diff(self.breakpoints, axis=1)
+
+    def __call__(self, x):
+        # Index of each motor's segment, found for all motors at once
+        k = np.clip(np.sum(self.breakpoints[:, 1:-1] <= np.asarray(x)[:, None], axis=1), 0, self.slopes.shape[1] - 1)
+        rows = np.arange(len(k))
+        return self.values[rows, k] + self.slopes[rows, k] * (x - self.breakpoints[rows, k])
+
+def linearize(power, speed_min, speed_max, segments=16):
+    """PiecewiseLinearPower through `segments` equal intervals of each motor's speed range"""
+    fractions = np.linspace(0, 1, segments + 1)
+    breakpoints = speed_min[:, None] + (speed_max - speed_min)[:, None] * fractions
+    values = np.column_stack([power(breakpoints[:, k]) for k in range(segments + 1)])
+    return PiecewiseLinearPower(breakpoints, values)
+
+def _solve_lp(model, curve):
+    """One variable per segment: x_i = breakpoint_i0 + sum_k s_ik with 0 <= s_ik <= width_ik"""
+    n, K = curve.slopes.shape
+    widths = np.diff(curve.breakpoints, axis=1)
+    # E maps the segment variables (motor-major) to the speeds
+    E = csc_matrix((np.ones(n * K), (np.repeat(np.arange(n), K), np.arange(n * K))), shape=(n, n * K))
+    A_ub, b_ub = model.constraints()
+    x0 = curve.breakpoints[:, 0]
+    result = linprog(curve.slopes.ravel(),
+                     A_ub=(A_ub @ E) if A_ub.shape[0] else None,
+                     b_ub=(b_ub - A_ub @ x0) if A_ub.shape[0] else None,
+                     bounds=np.column_stack([np.zeros(n * K), widths.ravel()]), method="highs")
+    if result.x is not None:
+        result.x = x0 + E @ result.x
+        result.fun = float(np.sum(curve.values[:, 0])) + result.fun
+    return result
+
+def _solve_qp(model, power):
+    """Exact convex QP through the HiGHS bindings of the highspy package"""
+    highspy = highs_solver()
+    if highspy is None:
+        raise ImportError("The qp method needs the highspy package; use method='ipm' without it")
+    A_ub, b_ub = model.constraints()
+    A = A_ub.tocsc()
+    # The coefficients may be scalars shared by all motors
+    linear, quadratic = (np.broadcast_to(c, model.n) for c in (power.linear, power.quadratic))
+    lp = highspy.HighsLp()
+    lp.num_col_, lp.num_row_ = model.n, A.shape[0]
+    lp.col_cost_, lp.col_lower_, lp.col_upper_ = linear, model.speed_min, model.speed_max
+    lp.row_lower_, lp.row_upper_ = np.full(A.shape[0], -np.inf), b_ub
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+    lp.a_matrix_.num_col_, lp.a_matrix_.num_row_ = A.shape[1], A.shape[0]
+    lp.a_matrix_.start_, lp.a_matrix_.index_, lp.a_matrix_.value_ = A.indptr, A.indices, A.data
+    # HiGHS minimizes c x + x Q x / 2, so Q = diag(2 quadratic)
+    hessian = highspy.HighsHessian()
+    hessian.dim_ = model.n
+    hessian.format_ = highspy.HessianFormat.kTriangular
+    hessian.start_ = np.arange(model.n + 1, dtype=np.int32)
+    hessian.index_ = np.arange(model.n, dtype=np.int32)
+    hessian.value_ = 2 * quadratic
+    model_qp = highspy.HighsModel()
+    model_qp.lp_ = lp
+    model_qp.hessian_ = hessian
+
+    highs = highspy.Highs()
+    highs.setOptionValue("output_flag", False)
+    highs.passModel(model_qp)
+    highs.run()
+    info = highs.getInfo()
+    status = highs.getModelStatus()
+    name = status.name if hasattr(status, "name") else str(status).rsplit(".", 1)[-1]
+    return OptimizeResult(x=np.array(highs.getSolution().col_value), fun=info.objective_function_value,
+                          status=STATUS.get(name, 4), message=highs.modelStatusToString(status),
+                          nit=info.qp_iteration_count)
+
+def _normal_equations(hessian, G, GT, dense, Gd, d):
+    """Solver for (diag(hessian) + G^T diag(d) G) dx = r.
+
+    The sparse rows of G are factorized with splu. The dense rows Gd (those marked
+    in `dense`) would fill the matrix completely, so they are added back as a
+    rank-k update by the Sherman-Morrison-Woodbury formula: with M_s the sparse
+    part and D_d = diag(d[dense]), M^-1 r = y - V (D_d^-1 + Gd V)^-1 Gd y, where
+    y = M_s^-1 r and V = M_s^-1 Gd^T.
+    """
+    sparse = ~dense
+    M = diags(hessian) + GT[:, sparse] @ diags(d[sparse]) @ G[sparse]
+    try:
+        lu = splu(M.tocsc())
+    except RuntimeError:
+        if not dense.any():
+            raise
+        # Motors held only by the dense rows leave the sparse part singular
+        lu = splu((M + GT[:, dense] @ diags(d[dense]) @ G[dense]).tocsc())
+        return lu.solve
+    if not dense.any():
+        return lu.solve
+    V = lu.solve(Gd.T.copy())
+    capacitance = np.diag(1 / d[dense]) + Gd @ V
+
+    def solve(r):
+        y = lu.solve(r)
+        return y - V @ np.linalg.solve(capacitance, Gd @ y)
+    return solve
+
+def _solve_ipm(model, power, tol=1e-8, max_iter=100):
+    """Mehrotra predictor-corrector interior point for min sum P_i(x_i) s.t. G x <= h.
+
+    G stacks the model's constraint rows and its finite speed bounds. With slacks s
+    and multipliers z, each Newton step solves (diag(P'') + G^T diag(z/s) G) dx = r,
+    a sparse system factorized once per iteration and used for both directions.
+    Rows spanning more than DENSE_ROW_FRACTION of the motors (a plant-wide demand)
+    are kept out of the factorization, see _normal_equations.
+
+    On an infeasible model the multipliers of the conflicting rows grow without
+    bound until they prove the infeasibility, which is reported with linprog's
+    status 2.
+    """
+    A_ub, b_ub = model.constraints()
+    lower, upper = np.isfinite(model.speed_min), np.isfinite(model.speed_max)
+    I = eye(model.n, format="csr")
+    G = vstack([A_ub, -I[lower], I[upper]], format="csr")
+    h = np.concatenate([b_ub, -model.speed_min[lower], model.speed_max[upper]])
+    GT = G.T.tocsc()
+    m = G.shape[0]
+    dense = np.diff(G.indptr) > DENSE_ROW_FRACTION * model.n
+    Gd = G[dense].toarray()
+
+    # Start inside the speed range; the slacks and multipliers start at one
+    x = np.where(lower & upper, (model.speed_min + model.speed_max) / 2,
+                 np.where(lower, model.speed_min + 1, np.where(upper, model.speed_max - 1, 0.0)))
+    s = np.maximum(h - G @ x, 1.0)
+    z = np.ones(m)
+    scale = 1 + max(np.abs(h).max(initial=0), np.abs(power.gradient(x)).max())
+
+    def infeasible():
+        # y = z / sum(z) bounds y G x <= y h for every feasible x, and over the speed
+        # range y G x >= min w x with w = G^T y; h y below that minimum proves that
+        # no feasible x exists (a Farkas certificate with the bounds folded in)
+        y = z / z.sum()
+        w = GT @ y
+        if np.any(((w > 0) & ~lower) | ((w < 0) & ~upper)):
+            return False
+        low = np.where(w > 0, model.speed_min, np.where(w < 0, model.speed_max, 0.0))
+        return h @ y - w @ low < -tol * (np.abs(h) @ y)
+
+    def result(status, message):
+        return OptimizeResult(x=x, fun=float(np.sum(power(x))), status=status, success=status == 0,
+                              message=message, nit=it)
+
+    for it in range(max_iter):
+        r_d = power.gradient(x) + GT @ z
+        r_p = G @ x + s - h
+        mu = s @ z / m
+        if max(np.abs(r_d).max(), np.abs(r_p).max()) < tol * scale and mu < tol * scale:
+            return result(0, "Optimal")
+        if infeasible():
+            return result(2, "The problem is infeasible")
+
+        d = z / s
+        # Convex curves have P'' >= 0 on the speed range; infeasible iterates may leave it
+        try:
+            solve = _normal_equations(np.maximum(power.hessian(x), 0.0), G, GT, dense, Gd, d)
+        except RuntimeError:
+            # The multipliers overflowed before they formed a certificate
+            return result(2, "The problem is infeasible") if infeasible() else result(4, "Singular Newton system")
+
+        def direction(r_c):
+            # S dz + Z ds = -r_c, G dx + ds = -r_p, H dx + G^T dz = -r_d
+            dx = solve(-r_d - GT @ ((z * r_p - r_c) / s))
+            ds = -r_p - G @ dx
+            return dx, ds, (-r_c - z * ds) / s
+
+        def step_to_boundary(v, dv):
+            shrinking = dv < 0
+            return min(1.0, np.min(-v[shrinking] / dv[shrinking], initial=np.inf))
+
+        dx, ds, dz = direction(s * z)
+        alpha = min(step_to_boundary(s, ds), step_to_boundary(z, dz))
+        sigma = (((s + alpha * ds) @ (z + alpha * dz)) / m / mu) ** 3
+        dx, ds, dz = direction(s * z + ds * dz - sigma * mu)
+        alpha = min(1.0, 0.99 * min(step_to_boundary(s, ds), step_to_boundary(z, dz)))
+        x += alpha * dx
+        s += alpha * ds
+        z += alpha * dz
+    it = max_iter
+    return result(2, "The problem is infeasible") if infeasible() else result(1, "Iteration limit reached")
+
+def solve_power_dispatch(model, power, method="auto", segments=16, tol=1e-8):
+    """Minimize sum_i P_i(x_i) over the bounds and constraints of a DispatchModel.
+
+    power is a PolynomialPower or a PiecewiseLinearPower; model.cost is not used.
+    method is "lp" (polynomials are first linearized with `segments` intervals per
+    motor, which needs finite speed limits), "qp" (quadratic curves, exact),
+    "ipm" (smooth convex curves, to tolerance `tol`) or "auto": "lp" for piecewise-
+    linear curves, "qp" for quadratic ones up to QP_MAX_MOTORS when highspy is
+    installed and "ipm" otherwise.
+    """
+    quadratic = isinstance(power, PolynomialPower) and not np.any(power.cubic)
+    if method == "auto":
+        if isinstance(power, PiecewiseLinearPower):
+            method = "lp"
+        else:
+            qp = quadratic and model.n <= QP_MAX_MOTORS and highs_solver() is not None
+            method = "qp" if qp else "ipm"
+
+    if method == "lp":
+        curve = power if isinstance(power, PiecewiseLinearPower) else linearize(
+            power, model.speed_min, model.speed_max, segments)
+        result = _solve_lp(model, curve)
+    elif method == "qp":
+        if not quadratic:
+            raise ValueError("The qp method needs a PolynomialPower without cubic terms")
+        result = _solve_qp(model, power)
+    elif method == "ipm":
+        if not isinstance(power, PolynomialPower):
+            raise ValueError("The ipm method needs a smooth PolynomialPower curve")
+        result = _solve_ipm(model, power, tol)
+    else:
+        raise ValueError(f"Unknown method {method!r}, expected 'auto', 'lp', 'qp' or 'ipm'")
+
+    result.method = method
+    result.success = result.status == 0
+    if result.x is not None and isinstance(power, PolynomialPower):
+        # Report the power of the curve itself, also for the linearized LP
+        result.fun = float(np.sum(power(result.x)))
+    return result
@@ -0,0 +1,110 @@
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import time
+import numpy as np
+from motor_dispatch import DispatchOptimizer
+
+# Monte Carlo evaluation of the motor dispatch LP over many (cost, limit) scenarios.
+#
+# Scenarios are identified by a hash of the model structure and their parameters.
+# Repeated scenarios, within a batch and across calls, are served from a result
+# cache, and only the distinct ones are solved: in chunks, each by one warm-started
+# DispatchOptimizer (successive scenarios differ little, so every solve restarts
+# from the previous basis), in a process pool when workers > 1.
+
+# Least recently used scenarios are evicted once the cached solutions take more
+# than this many bytes (a 10^4-motor solution takes 80 kB)
+RESULT_CACHE_MAX_BYTES = 256 * 2 ** 20
+
+_result_cache = OrderedDict()
+_result_cache_bytes = 0
+
+def clear_result_cache():
+    global _result_cache_bytes
+    _result_cache.clear()
+    _result_cache_bytes = 0
+
+def _model_key(model):
+    A_ub, b_ub = model.constraints()
+    digest = hashlib.blake2b(digest_size=16)
+    for array in (A_ub.indptr, A_ub.indices, A_ub.data, model.speed_min, model.speed_max):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.digest()
+
+def _scenario_keys(model_key, costs, limits):
+    return [hashlib.blake2b(model_key + c.tobytes() + b.tobytes(), digest_size=16).digest()
+            for c, b in zip(costs, limits)]
+
+# The model is sent once to every worker process, not with every chunk
+_worker_model = None
+
+def _init_worker(model):
+    global _worker_model
+    _worker_model = model
+
+def _solve_chunk(args):
+    costs, limits, model = args
+    model = _worker_model if model is None else model
+    optimizer = DispatchOptimizer(model)
+    objective = np.full(len(costs), np.nan)
+    x = np.full((len(costs), model.n), np.nan)
+    status = np.empty(len(costs), dtype=int)
+    for k in range(len(costs)):
+        result = optimizer.solve(cost=costs[k], limits=limits[k])
+        status[k] = result.status
+        if result.success:
+            objective[k], x[k] = result.fun, result.x
+    return objective, x, status
+
+def run_scenarios(model, costs=None, limits=None, workers=None, chunk_size=256):
+    """Solve the DispatchModel for every scenario and return (results, stats).
+
+    costs has shape (n_scenarios, n_motors) and limits (n_scenarios, n_constraints),
+    the right-hand sides of model.constraints(); either may be omitted or given for a
+    single scenario, in which case the model's values are broadcast. results is a
+    dict of columns: "objective" (n_scenarios,), "x" (n_scenarios, n_motors) and
+    "status" (n_scenarios,), with linprog's status codes and NaN where no optimum was
+    found. stats counts the scenarios, the distinct ones, the cache hits and the
+    solves, and gives the wall time and the throughput in scenarios per second.
+    """
+    global _result_cache_bytes
+    start = time.perf_counter()
+    _, b_ub = model.constraints()
+    costs = model.cost if costs is None else costs
+    limits = b_ub if limits is None else limits
+    S = max(np.shape(costs)[0] if np.ndim(costs) == 2 else 1, np.shape(limits)[0] if np.ndim(limits) == 2 else 1)
+    costs = np.ascontiguousarray(np.broadcast_to(np.asarray(costs, dtype=float), (S, model.n)))
+    limits = np.ascontiguousarray(np.broadcast_to(np.asarray(limits, dtype=float), (S, len(b_ub))))
+
+    keys = _scenario_keys(_model_key(model), costs, limits)
+    first = {}
+    for k, key in enumerate(keys):
+        first.setdefault(key, k)
+    pending = [k for key, k in first.items() if key not in _result_cache]
+
+    if pending:
+        chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+        if workers and workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model,)) as pool:
+                solved = list(pool.map(_solve_chunk, [(costs[c], limits[c], None) for c in chunks]))
+        else:
+            solved = [_solve_chunk((costs[c], limits[c], model)) for c in chunks]
+        for chunk, (objective, x, status) in zip(chunks, solved):
+            for j, k in enumerate(chunk):
+                # A copy, so the cache does not keep the whole chunk's array alive
+                _result_cache[keys[k]] = (objective[j], x[j].copy(), status[j])
+                _result_cache_bytes += x[j].nbytes
+
+    results = {"objective": np.empty(S), "x": np.empty((S, model.n)), "status": np.empty(S, dtype=int)}
+    for k, key in enumerate(keys):
+        objective, x, status = _result_cache[key]
+        _result_cache.move_to_end(key)
+        results["objective"][k], results["x"][k], results["status"][k] = objective, x, status
+    while _result_cache_bytes > RESULT_CACHE_MAX_BYTES:
+        _result_cache_bytes -= _result_cache.popitem(last=False)[1][1].nbytes
+
+    elapsed = time.perf_counter() - start
+    stats = {"scenarios": S, "distinct": len(first), "cache_hits": S - len(pending), "solves": len(pending),
+             "time": elapsed, "scenarios_per_second": S / elapsed}
+    return results, stats